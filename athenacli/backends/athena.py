@@ -1,17 +1,122 @@
 # encoding: utf-8
 """Amazon Athena database backend."""
 
+import importlib
 import logging
+import threading
+import time
+from contextlib import contextmanager
+
 import pyathena
+from pyathena.cursor import Cursor
+from pyathena.model import AthenaQueryExecution
 
 from athenacli.backends.base import DatabaseBackend
+from athenacli.packages.format_utils import humanize_size
+from athenacli.packages.parseutils import is_read_only
 
 logger = logging.getLogger(__name__)
 
+# Query status polling backoff, in seconds. Fast queries (and result reuse
+# hits) finish well under the old fixed 200ms interval, long running ones
+# don't need a GetQueryExecution call every 200ms.
+POLL_INTERVAL_MIN = 0.01
+POLL_INTERVAL_MAX = 2.0
+POLL_INTERVAL_MULTIPLIER = 1.5
+
+
+class BackoffPollMixin(object):
+    """Poll the query state with an exponentially growing interval.
+
+    pyathena sleeps a fixed ``poll_interval`` between GetQueryExecution
+    calls; this starts at ``poll_interval`` and grows it up to
+    ``POLL_INTERVAL_MAX``.
+    """
+
+    def _backoff_poll(self, query_id):
+        interval = self._poll_interval
+        while True:
+            query_execution = self._get_query_execution(query_id)
+            if self._on_poll:
+                self._on_poll(query_execution)
+            if query_execution.state in (
+                AthenaQueryExecution.STATE_SUCCEEDED,
+                AthenaQueryExecution.STATE_FAILED,
+                AthenaQueryExecution.STATE_CANCELLED,
+            ):
+                return query_execution
+            time.sleep(interval)
+            interval = min(interval * POLL_INTERVAL_MULTIPLIER, POLL_INTERVAL_MAX)
+
+    def _poll(self, query_id):
+        try:
+            return self._backoff_poll(query_id)
+        except KeyboardInterrupt:
+            if not self._kill_on_interrupt:
+                raise
+            logger.warning('Query canceled by user.')
+            self._cancel(query_id)
+            return self._backoff_poll(query_id)
+
+
+class AthenaCursor(BackoffPollMixin, Cursor):
+    """Default pyathena cursor with backoff polling."""
+
+
+# Cursors that download the result file from S3 in bulk instead of paging
+# through GetQueryResults: name -> (required package, module, class).
+RESULT_CURSORS = {
+    'pandas': ('pandas', 'pyathena.pandas.cursor', 'PandasCursor'),
+    'arrow': ('pyarrow', 'pyathena.arrow.cursor', 'ArrowCursor'),
+}
+
+
+def result_cursor_class(name):
+    """Return the cursor class to run user queries with.
+
+    Args:
+        name: 'default', 'pandas' or 'arrow'
+
+    Returns:
+        A pyathena cursor class with backoff polling. Falls back to
+        AthenaCursor if pandas/pyarrow is not installed.
+
+    Raises:
+        ValueError: If name is not a known cursor class
+    """
+    if not name or name == 'default':
+        return AthenaCursor
+
+    try:
+        requirement, module_name, class_name = RESULT_CURSORS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported cursor class: {name}. "
+            f"Supported: default, {', '.join(RESULT_CURSORS)}"
+        )
+
+    try:
+        importlib.import_module(requirement)
+        cursor_class = getattr(importlib.import_module(module_name), class_name)
+    except ImportError as e:
+        logger.warning('Cannot use the %s cursor (%s), using the default cursor.', name, e)
+        return AthenaCursor
+
+    return type(class_name, (BackoffPollMixin, cursor_class), {})
+
 
 class AthenaBackend(DatabaseBackend):
     """Amazon Athena backend implementation."""
 
+    # GetQueryResults returns at most 1000 rows per call and pyathena
+    # rejects a larger arraysize.
+    MAX_FETCH_SIZE = Cursor.DEFAULT_FETCH_SIZE
+
+    HAS_STATISTICS = True
+
+    # Athena supports output_location tracking
+    _SPECIAL_COMMANDS = frozenset(('output_location',))
+
     def __init__(
         self,
         aws_access_key_id=None,
@@ -23,7 +128,8 @@ class AthenaBackend(DatabaseBackend):
         database=None,
         result_reuse_enable=False,
         result_reuse_minutes=60,
-        catalog_name=None
+        catalog_name=None,
+        cursor_class=None
     ):
         """Initialize Athena backend.
 
@@ -38,6 +144,8 @@ class AthenaBackend(DatabaseBackend):
             result_reuse_enable: Enable query result reuse
             result_reuse_minutes: Minutes to reuse query results
             catalog_name: Athena catalog name (default: AwsDataCatalog)
+            cursor_class: Cursor for user queries: 'default', 'pandas' or 'arrow'.
+                          Metadata queries always use the default cursor.
         """
         # Handle database parameter that may contain catalog.database format
         if database and '.' in database:
@@ -54,12 +162,17 @@ class AthenaBackend(DatabaseBackend):
         self.catalog_name = catalog_name or 'AwsDataCatalog'
         self.result_reuse_enable = result_reuse_enable
         self.result_reuse_minutes = result_reuse_minutes
+        self.result_cursor_class = result_cursor_class(cursor_class)
 
         self.connect()
 
     def connect(self, database=None):
         """Establish connection to Athena.
 
+        If already connected, switching to another database reuses the
+        existing connection. Without a database a new connection is built,
+        e.g. to renew the temporary credentials of an assumed role.
+
         Args:
             database: Optional database to connect to. Can be in format
                      'catalog.database' to specify both catalog and database.
@@ -69,29 +182,60 @@ class AthenaBackend(DatabaseBackend):
         if database and '.' in database:
             catalog_name, database = database.split('.', 1)
 
+        if self.conn and database:
+            # Cursors take the schema and catalog from the connection when
+            # they are created, so switching databases only needs these
+            # updated rather than a new connection (boto3 session, STS).
+            self.conn.schema_name = database
+            self.conn.catalog_name = catalog_name
+        else:
+            old_conn, self.conn = self.conn, self._open_connection(
+                database or self.database, catalog_name)
+            if old_conn:
+                # Closing cancels the connection's pending queries; don't
+                # make the user wait for it.
+                threading.Thread(
+                    target=old_conn.close, name='athena_close',
+                    daemon=True).start()
+
+        self.database = database or self.database
+        self.invalidate_metadata_cache()
+
+    def _open_connection(self, schema_name, catalog_name):
+        """Open a pyathena connection to a database."""
         conn_params = {
             'aws_access_key_id': self.aws_access_key_id,
             'aws_secret_access_key': self.aws_secret_access_key,
             'region_name': self.region_name,
             's3_staging_dir': self.s3_staging_dir,
             'work_group': self.work_group,
-            'schema_name': database or self.database,
+            'schema_name': schema_name,
             'role_arn': self.role_arn,
-            'poll_interval': 0.2,  # 200ms
+            'poll_interval': POLL_INTERVAL_MIN,
+            'cursor_class': AthenaCursor,
             'catalog_name': catalog_name
         }
 
-        # Add result reuse parameters if enabled
-        if self.result_reuse_enable:
-            conn_params['result_reuse_enable'] = True
-            conn_params['result_reuse_minutes'] = self.result_reuse_minutes
+        return pyathena.connect(**conn_params)
 
-        conn = pyathena.connect(**conn_params)
-        self.database = database or self.database
+    def create_connection(self):
+        """Open a new connection to the current database.
 
-        if self.conn:
-            self.conn.close()
-        self.conn = conn
+        Not used for metadata queries, see metadata_cursor().
+        """
+        catalog_name = self.conn.catalog_name if self.conn else self.catalog_name
+        return self._open_connection(self.database, catalog_name)
+
+    @contextmanager
+    def metadata_cursor(self):
+        """Context manager yielding a cursor on the shared connection.
+
+        pyathena connections are thread-safe HTTP clients; queries don't
+        serialize on them, so metadata queries don't need pooled
+        connections, each costing a boto3 session and possibly an STS call.
+        """
+        with self.get_cursor() as cur:
+            yield cur
 
     def close(self):
         """Close Athena connection."""
@@ -99,6 +243,44 @@ class AthenaBackend(DatabaseBackend):
             self.conn.close()
             self.conn = None
 
+    def get_query_cursor(self):
+        """Get a cursor of the configured cursor_class for user queries."""
+        if not self.conn:
+            raise Exception("Not connected to database")
+        return self.conn.cursor(self.result_cursor_class)
+
+    def execute(self, cursor, sql):
+        """Execute a user statement, reusing previous results for reads.
+
+        Result reuse is requested per query and only for read-only
+        statements; CTAS, INSERT and DDL always run.
+
+        Args:
+            cursor: PyAthena cursor
+            sql: Single SQL statement
+        """
+        if self.result_reuse_enable and is_read_only(sql):
+            cursor.execute(
+                sql,
+                result_reuse_enable=True,
+                result_reuse_minutes=self.result_reuse_minutes
+            )
+        else:
+            cursor.execute(sql)
+
+    def cancel(self, cursor):
+        """Cancel the query of a PyAthena cursor, once it has started.
+
+        Args:
+            cursor: PyAthena cursor executing in another thread
+        """
+        if not cursor.query_id:
+            return
+        try:
+            cursor.cancel()
+        except Exception as e:
+            logger.debug('Cancelling query %s failed: %r', cursor.query_id, e)
+
     def format_statistics(self, cursor):
         """Format Athena execution statistics.
 
@@ -106,7 +288,8 @@ class AthenaBackend(DatabaseBackend):
             cursor: PyAthena cursor after query execution
 
         Returns:
-            str: Formatted statistics including execution time, data scanned, and cost
+            str: Formatted statistics including execution time, data scanned, cost
+                 and whether a previous result was reused
         """
         if not cursor:
             return ''
@@ -114,39 +297,11 @@ class AthenaBackend(DatabaseBackend):
         # Most regions are $5 per TB: https://aws.amazon.com/athena/pricing/
         approx_cost = cursor.data_scanned_in_bytes / (1024 ** 4) * 5
 
-        return '\nExecution time: %d ms, Data scanned: %s, Approximate cost: $%.2f' % (
+        stats = '\nExecution time: %d ms, Data scanned: %s, Approximate cost: $%.2f' % (
             cursor.engine_execution_time_in_millis,
-            self._humanize_size(cursor.data_scanned_in_bytes),
+            humanize_size(cursor.data_scanned_in_bytes),
             approx_cost
         )
-
-    def _humanize_size(self, num_bytes):
-        """Convert bytes to human-readable format.
-
-        Args:
-            num_bytes: Number of bytes
-
-        Returns:
-            str: Human-readable size (e.g., '1.5 GB')
-        """
-        suffixes = ['B', 'KB', 'MB', 'GB', 'TB']
-
-        suffix_index = 0
-        while num_bytes >= 1024 and suffix_index < len(suffixes) - 1:
-            num_bytes /= 1024.0
-            suffix_index += 1
-
-        num = ('%.2f' % num_bytes).rstrip('0').rstrip('.')
-        return '%s %s' % (num, suffixes[suffix_index])
-
-    def supports_special_command(self, command):
-        """Check if Athena backend supports a special command.
-
-        Args:
-            command: Special command name
-
-        Returns:
-            bool: True if supported
-        """
-        # Athena supports output_location tracking
-        return command == 'output_location'
+        if getattr(cursor, 'reused_previous_result', None):
+            stats += ', Reused previous result'
+        return stats
@@ -1,7 +1,19 @@
 # encoding: utf-8
 """Abstract base class for database backends."""
 
+import os
+import queue
+import time
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+
+def _env_fetch_size(default=10240):
+    """Rows per fetchmany() call, overridable with ATHENACLI_FETCH_SIZE."""
+    try:
+        return max(int(os.environ['ATHENACLI_FETCH_SIZE']), 1)
+    except (KeyError, ValueError):
+        return default
 
 
 class DatabaseBackend(ABC):
@@ -16,18 +28,53 @@ class DatabaseBackend(ABC):
     TABLES_QUERY = 'SHOW TABLES'
     TABLE_COLUMNS_QUERY = '''
         SELECT table_name, column_name FROM information_schema.columns
-        WHERE table_schema = '%s'
+        WHERE table_schema = %(schema)s
         ORDER BY table_name, ordinal_position
     '''
 
-    def __init__(self, database=None):
+    # Seconds to keep databases()/tables()/table_columns() results around so
+    # repeated completion refreshes don't re-run the metadata queries.
+    METADATA_CACHE_TTL = 60
+
+    # Rows requested per fetchmany() call, and the most the driver accepts.
+    FETCH_SIZE = _env_fetch_size()
+    MAX_FETCH_SIZE = None
+
+    # Whether format_statistics() reports anything for executed queries.
+    HAS_STATISTICS = False
+
+    # Special commands the backend supports, see supports_special_command().
+    _SPECIAL_COMMANDS = frozenset()
+
+    # Whether one execute() call can run several statements, see
+    # is_batchable().
+    SUPPORTS_MULTI_STATEMENT = False
+
+    # Idle connections kept for metadata queries, enough for the concurrent
+    # queries of a completion refresh.
+    POOL_SIZE = 3
+
+    def __init__(self, database=None, fetch_size=None):
         """Initialize backend with optional initial database.
 
         Args:
             database: Initial database/schema to connect to
+            fetch_size: Rows per fetch, defaults to FETCH_SIZE
         """
         self.database = database
+        self._fetch_size = fetch_size
         self.conn = None
+        self._metadata_cache = {}
+        self._pool = queue.Queue(maxsize=self.POOL_SIZE)
+        self._pool_generation = 0
+
+    @property
+    def fetch_size(self):
+        """Rows requested per fetchmany() call, used as cursor.arraysize."""
+        fetch_size = self._fetch_size or self.FETCH_SIZE
+        if self.MAX_FETCH_SIZE:
+            fetch_size = min(fetch_size, self.MAX_FETCH_SIZE)
+        return fetch_size
 
     @abstractmethod
     def connect(self, database=None):
@@ -60,16 +107,143 @@ class DatabaseBackend(ABC):
             raise Exception("Not connected to database")
         return self.conn.cursor()
 
+    def get_query_cursor(self):
+        """Get a cursor to run user statements with.
+
+        Metadata queries use metadata_cursor(); backends can override this to
+        run user queries with a different cursor type.
+
+        Returns:
+            Database cursor object
+        """
+        return self.get_cursor()
+
+    def execute(self, cursor, sql):
+        """Execute a user statement on the cursor.
+
+        Args:
+            cursor: Cursor obtained from get_cursor()
+            sql: Single SQL statement
+        """
+        cursor.execute(sql)
+
+    def cancel(self, cursor):
+        """Cancel the statement executing on a cursor in another thread.
+
+        Best effort; the default implementation does nothing.
+
+        Args:
+            cursor: Cursor obtained from get_query_cursor()
+        """
+        pass
+
+    @abstractmethod
+    def create_connection(self):
+        """Open a new connection to the current database.
+
+        Used to fill the metadata connection pool.
+
+        Returns:
+            DB-API connection
+        """
+        pass
+
+    @contextmanager
+    def metadata_cursor(self):
+        """Context manager yielding a cursor on a pooled connection.
+
+        Metadata queries (e.g. from the completion refresh thread) run on
+        their own connections so they neither block nor share a connection
+        with the interactive user's queries.
+        """
+        generation = self._pool_generation
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self.create_connection()
+
+        try:
+            with conn.cursor() as cur:
+                yield cur
+        except BaseException:
+            conn.close()
+            raise
+
+        if generation != self._pool_generation:
+            # connect() or close() was called meanwhile
+            conn.close()
+            return
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def reset_pool(self):
+        """Close the pooled metadata connections.
+
+        Connections that are checked out are closed when returned.
+        """
+        self._pool_generation += 1
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+
+    def iter_batches(self, cursor):
+        """Yields the rows of an executed cursor in lists of fetch_size rows.
+
+        Args:
+            cursor: Cursor after query execution
+        """
+        cursor.arraysize = self.fetch_size
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            yield rows
+
+    def iter_rows(self, cursor):
+        """Yields the rows of an executed cursor, fetch_size rows at a time.
+
+        Args:
+            cursor: Cursor after query execution
+        """
+        for rows in self.iter_batches(cursor):
+            yield from rows
+
+    def invalidate_metadata_cache(self):
+        """Drop cached databases/tables/columns so the next call re-queries."""
+        self._metadata_cache.clear()
+
+    def _cached_metadata(self, name, query):
+        """Return the rows of *query* for the current database, cached.
+
+        Args:
+            name: Cache key for the metadata kind (e.g. 'tables')
+            query: Callable returning an iterable of rows
+
+        Returns:
+            tuple: Materialized rows
+        """
+        key = (self.database, name)
+        now = time.monotonic()
+        entry = self._metadata_cache.get(key)
+        if entry is not None and now - entry[0] < self.METADATA_CACHE_TTL:
+            return entry[1]
+
+        rows = tuple(query())
+        self._metadata_cache[key] = (now, rows)
+        return rows
+
     def tables(self):
         """Yields table names from current database.
 
         Yields:
             tuple: Table information rows
         """
-        with self.get_cursor() as cur:
-            cur.execute(self.TABLES_QUERY)
-            for row in cur:
-                yield row
+        yield from self._cached_metadata('tables', self._query_tables)
 
     def table_columns(self):
         """Yields (table_name, column_name) tuples for current database.
@@ -77,10 +251,7 @@ class DatabaseBackend(ABC):
         Yields:
             tuple: (table_name, column_name)
         """
-        with self.get_cursor() as cur:
-            cur.execute(self.TABLE_COLUMNS_QUERY % self.database)
-            for row in cur:
-                yield row
+        yield from self._cached_metadata('table_columns', self._query_table_columns)
 
     def databases(self):
         """Get list of available databases.
@@ -88,7 +259,23 @@ class DatabaseBackend(ABC):
         Returns:
             list: Database names
         """
-        with self.get_cursor() as cur:
+        return list(self._cached_metadata('databases', self._query_databases))
+
+    def _query_tables(self):
+        """Query table rows, bypassing the metadata cache."""
+        with self.metadata_cursor() as cur:
+            cur.execute(self.TABLES_QUERY)
+            yield from self.iter_rows(cur)
+
+    def _query_table_columns(self):
+        """Query (table_name, column_name) rows, bypassing the metadata cache."""
+        with self.metadata_cursor() as cur:
+            cur.execute(self.TABLE_COLUMNS_QUERY, {'schema': self.database})
+            yield from self.iter_rows(cur)
+
+    def _query_databases(self):
+        """Query database names, bypassing the metadata cache."""
+        with self.metadata_cursor() as cur:
             cur.execute(self.DATABASES_QUERY)
             return [x[0] for x in cur.fetchall()]
 
@@ -113,6 +300,19 @@ class DatabaseBackend(ABC):
         Returns:
             bool: True if supported
         """
-        # By default, backends don't support special commands
-        # Override in subclasses as needed
+        return command in self._SPECIAL_COMMANDS
+
+    def is_batchable(self, sql):
+        """Check if a statement can be executed together with its neighbours.
+
+        Only used if SUPPORTS_MULTI_STATEMENT is set and SQLExecute was
+        created with batch_statements. Batched statements must not return
+        rows.
+
+        Args:
+            sql: Single SQL statement
+
+        Returns:
+            bool: True if the statement can be batched
+        """
         return False
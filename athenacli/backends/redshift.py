@@ -3,6 +3,10 @@
 
 import logging
 import os
+import re
+import threading
+import time
+from collections import OrderedDict
 
 try:
     import psycopg2
@@ -25,19 +29,53 @@ class RedshiftBackend(DatabaseBackend):
 
     # Redshift-specific queries (PostgreSQL compatible)
     DATABASES_QUERY = 'SELECT datname FROM pg_database WHERE datistemplate = false ORDER BY datname'
-    # Query all user schemas (exclude system schemas like pg_catalog, information_schema)
-    # Return schema and table/view separately to avoid quoting issues
-    # Union tables and views together
+    # Query tables, views and materialized views of all user schemas (exclude
+    # system schemas like pg_catalog, information_schema) straight from the
+    # catalog. The schema-qualified name is concatenated server-side as plain
+    # text, which avoids the quoting a regclass cast would add.
     TABLES_QUERY = """
-        SELECT schemaname, tablename
-        FROM pg_tables
-        WHERE schemaname NOT IN ('pg_catalog', 'information_schema', 'pg_internal')
-        UNION ALL
-        SELECT schemaname, viewname
-        FROM pg_views
-        WHERE schemaname NOT IN ('pg_catalog', 'information_schema', 'pg_internal')
-        ORDER BY 1, 2
+        SELECT n.nspname || '.' || c.relname
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relkind IN ('r', 'v', 'm')
+          AND n.nspname NOT IN ('pg_catalog', 'information_schema', 'pg_internal')
+        ORDER BY 1
     """
+    # Same relations as TABLES_QUERY, one row per column in ordinal order.
+    TABLE_COLUMNS_QUERY = """
+        SELECT n.nspname || '.' || c.relname, a.attname
+        FROM pg_attribute a
+        JOIN pg_class c ON c.oid = a.attrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relkind IN ('r', 'v', 'm')
+          AND n.nspname NOT IN ('pg_catalog', 'information_schema', 'pg_internal')
+          AND a.attnum > 0
+          AND NOT a.attisdropped
+        ORDER BY 1, a.attnum
+    """
+
+    # Lifetime requested for IAM cluster credentials, in seconds.
+    IAM_CREDENTIALS_DURATION = 3600
+    # Cached IAM credentials are renewed this many seconds before they expire.
+    IAM_REFRESH_MARGIN = 300
+
+    # TCP keepalives, so that idle connections are not dropped by load
+    # balancers; connection parameters passed to __init__ take precedence.
+    KEEPALIVE_PARAMS = {'keepalives': 1, 'keepalives_idle': 60}
+    # Connections to previously used databases kept open by connect(), so
+    # switching back to them needs no new connection.
+    MAX_IDLE_CONNECTIONS = 2
+
+    # Several statements sent in one query run in an implicit transaction.
+    SUPPORTS_MULTI_STATEMENT = True
+    # Statements that return no rows and may run inside a transaction block.
+    # Kept to DML and plain CREATE TABLE/VIEW: e.g. VACUUM, ALTER COLUMN TYPE
+    # or DDL on external tables may not, and can't be told apart here.
+    BATCHABLE_RE = re.compile(
+        r'\s*(?:insert|update|delete'
+        r'|create\s+(?:(?:local\s+)?(?:temp|temporary)\s+)?table'
+        r'|create\s+(?:or\s+replace\s+)?view)\b',
+        re.IGNORECASE)
 
     def __init__(
         self,
@@ -50,6 +88,7 @@ class RedshiftBackend(DatabaseBackend):
         connect_timeout=None,
         aws_profile=None,
         region=None,
+        fetch_size=None,
         **kwargs
     ):
         """Initialize Redshift backend.
@@ -64,6 +103,7 @@ class RedshiftBackend(DatabaseBackend):
             connect_timeout: Connection timeout in seconds
             aws_profile: AWS profile for IAM authentication
             region: AWS region (default: us-east-1)
+            fetch_size: Rows per fetch (default: FETCH_SIZE)
             **kwargs: Additional psycopg2 connection parameters
         """
         if psycopg2 is None:
@@ -72,7 +112,7 @@ class RedshiftBackend(DatabaseBackend):
                 "Install with: pip install psycopg2-binary"
             )
 
-        super().__init__(database=database)
+        super().__init__(database=database, fetch_size=fetch_size)
 
         self.host = host
         self.port = port
@@ -83,12 +123,8 @@ class RedshiftBackend(DatabaseBackend):
         self.region = region or os.environ.get('AWS_DEFAULT_REGION', 'us-east-1')
 
         # Parse user - strip "IAM:" prefix if present
-        if user and user.startswith('IAM:'):
-            self.user = user[4:]  # Remove "IAM:" prefix
-            self.use_iam = True
-        else:
-            self.user = user
-            self.use_iam = False
+        self.use_iam = bool(user) and user.startswith('IAM:')
+        self.user = user[4:] if self.use_iam else user
 
         # If no password provided, enable IAM authentication
         if password is None and self.user:
@@ -97,11 +133,30 @@ class RedshiftBackend(DatabaseBackend):
         else:
             self.password = password
 
+        # Extract cluster identifier from hostname
+        # Format: cluster-name.region.redshift.amazonaws.com
+        self._cluster_id = host.split('.', 1)[0] if host else None
+        if self.use_iam and not self.password and not self._cluster_id:
+            raise ValueError("Cannot extract cluster identifier from host")
+
+        # (cluster_id, db_user, db_name) -> (expiry, db_user, db_password)
+        self._iam_cache = {}
+        self._iam_lock = threading.Lock()
+        self._iam_timer = None
+        # database whose credentials _iam_timer renews
+        self._iam_timer_database = None
+
+        # db_name -> idle connection, least recently used first
+        self._idle_connections = OrderedDict()
+
         self.connect()
 
     def _get_iam_credentials(self, database):
         """Get temporary IAM credentials for Redshift.
 
+        Credentials are cached until IAM_REFRESH_MARGIN seconds before they
+        expire, and renewed in the background before that happens.
+
         Args:
             database: Database name for credentials
 
@@ -112,49 +167,121 @@ class RedshiftBackend(DatabaseBackend):
             ImportError: If boto3 is not available
             Exception: If unable to get credentials
         """
+        database = database or 'dev'
+        with self._iam_lock:
+            cached = self._iam_cache.get(self._iam_cache_key(database))
+            if cached and cached[0] - time.time() > self.IAM_REFRESH_MARGIN:
+                self._follow_iam_refresh(database)
+                return cached[1], cached[2]
+
+        return self._refresh_iam_credentials(database)
+
+    def _iam_cache_key(self, database):
+        return (self._cluster_id, self.user, database)
+
+    def _refresh_iam_credentials(self, database):
+        """Fetch IAM credentials, cache them and schedule their renewal.
+
+        Returns:
+            tuple: (db_user, db_password) with IAM credentials
+        """
+        expiry, db_user, db_password = self._fetch_iam_credentials(database)
+        with self._iam_lock:
+            self._iam_cache[self._iam_cache_key(database)] = (
+                expiry, db_user, db_password)
+            self._schedule_iam_refresh(database, expiry)
+        return db_user, db_password
+
+    def _follow_iam_refresh(self, database):
+        """Renew the cached credentials of *database* rather than those of
+        the database renewed so far, e.g. after switching back to it. Call
+        with _iam_lock held.
+        """
+        cached = self._iam_cache.get(self._iam_cache_key(database))
+        if cached and self._iam_timer_database != database:
+            self._schedule_iam_refresh(database, cached[0])
+
+    def _schedule_iam_refresh(self, database, expiry):
+        """Renew a database's credentials IAM_REFRESH_MARGIN seconds before
+        *expiry*, replacing any pending renewal. Call with _iam_lock held.
+        """
+        if self._iam_timer:
+            self._iam_timer.cancel()
+        delay = max(expiry - self.IAM_REFRESH_MARGIN - time.time(), 0)
+        self._iam_timer = threading.Timer(
+            delay, self._prewarm_iam_credentials, args=(database,))
+        self._iam_timer.daemon = True
+        self._iam_timer.start()
+        self._iam_timer_database = database
+
+    def _prewarm_iam_credentials(self, database):
+        """Renew cached IAM credentials before they expire."""
+        # only keep the credentials of the open connection's database warm
+        if self.conn is None or database != self.database:
+            with self._iam_lock:
+                if self._iam_timer_database == database:
+                    # reusing the cached credentials schedules a new renewal
+                    self._iam_timer_database = None
+            return
+        try:
+            self._refresh_iam_credentials(database)
+        except Exception as e:
+            logger.debug("Failed to renew IAM credentials: %r", e)
+
+    def _fetch_iam_credentials(self, database):
+        """Request temporary IAM credentials from the Redshift API.
+
+        Args:
+            database: Database name for credentials
+
+        Returns:
+            tuple: (expiry, db_user, db_password), expiry as epoch seconds
+        """
         if boto3 is None:
             raise ImportError(
                 "boto3 is required for IAM authentication. "
                 "Install with: pip install boto3"
             )
 
-        # Extract cluster identifier from hostname
-        # Format: cluster-name.region.redshift.amazonaws.com
-        cluster_id = self.host.split('.')[0] if self.host else None
-        if not cluster_id:
-            raise ValueError("Cannot extract cluster identifier from host")
-
-        logger.info("Getting IAM credentials for Redshift cluster: %s", cluster_id)
+        logger.info("Getting IAM credentials for Redshift cluster: %s", self._cluster_id)
 
         try:
             session = boto3.Session(profile_name=self.aws_profile)
             redshift_client = session.client('redshift', region_name=self.region)
 
+            requested_at = time.time()
             response = redshift_client.get_cluster_credentials(
                 DbUser=self.user,
-                DbName=database or 'dev',
-                ClusterIdentifier=cluster_id,
-                DurationSeconds=3600,  # 1 hour
+                DbName=database,
+                ClusterIdentifier=self._cluster_id,
+                DurationSeconds=self.IAM_CREDENTIALS_DURATION,
                 AutoCreate=False
             )
 
             db_user = response['DbUser']
             db_password = response['DbPassword']
+            expiration = response.get('Expiration')
+            if expiration is not None:
+                expiry = expiration.timestamp()
+            else:
+                expiry = requested_at + self.IAM_CREDENTIALS_DURATION
 
             logger.info("Successfully obtained IAM credentials for user: %s", db_user)
-            return db_user, db_password
+            return expiry, db_user, db_password
 
         except Exception as e:
             logger.error("Failed to get IAM credentials: %s", e)
             raise
 
-    def connect(self, database=None):
-        """Establish connection to Redshift.
+    def _connection_params(self, db_name):
+        """Build psycopg2.connect() parameters for a database.
 
         Args:
-            database: Optional database to connect to
+            db_name: Database to connect to
+
+        Returns:
+            dict: Connection parameters
         """
-        db_name = database or self.database or 'dev'
         db_user = self.user
         db_password = self.password
 
@@ -174,35 +301,128 @@ class RedshiftBackend(DatabaseBackend):
         if self.connect_timeout:
             conn_params['connect_timeout'] = self.connect_timeout
 
+        conn_params.update(self.KEEPALIVE_PARAMS)
+
         # Add any extra parameters
         conn_params.update(self.extra_params)
 
         # Remove None values
-        conn_params = {k: v for k, v in conn_params.items() if v is not None}
+        return {k: v for k, v in conn_params.items() if v is not None}
 
-        try:
-            conn = psycopg2.connect(**conn_params)
-            # Set autocommit mode for DDL statements
-            conn.set_isolation_level(extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+    def _open_connection(self, db_name):
+        """Open an autocommit connection to a database."""
+        conn = psycopg2.connect(**self._connection_params(db_name))
+        # Set autocommit mode for DDL statements
+        conn.set_isolation_level(extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        return conn
 
-            self.database = db_name
+    def connect(self, database=None):
+        """Establish connection to Redshift.
+
+        Args:
+            database: Optional database to connect to
+        """
+        db_name = database or self.database or 'dev'
 
-            if self.conn:
-                self.conn.close()
-            self.conn = conn
+        try:
+            # Connections are only kept idle for databases other than the
+            # current one, so reconnecting to it opens a new connection.
+            conn = self._take_idle_connection(db_name)
+            if conn is None:
+                conn = self._open_connection(db_name)
+
+            old_database, self.database = self.database, db_name
+            if self.use_iam:
+                # a reused idle connection requested no credentials
+                with self._iam_lock:
+                    self._follow_iam_refresh(db_name)
+            self.invalidate_metadata_cache()
+            self.reset_pool()
+
+            old_conn, self.conn = self.conn, conn
+            if old_conn:
+                if old_database != db_name:
+                    self._park_connection(old_database, old_conn)
+                else:
+                    self._close_in_background(old_conn)
 
             logger.debug("Connected to Redshift: %s@%s:%s/%s",
-                        db_user, self.host, self.port, self.database)
+                        self.user, self.host, self.port, self.database)
         except psycopg2.Error as e:
             logger.error("Failed to connect to Redshift: %s", e)
             raise
 
+    def _take_idle_connection(self, db_name):
+        """Remove and return the usable idle connection to a database.
+
+        Returns:
+            connection or None
+        """
+        conn = self._idle_connections.pop(db_name, None)
+        if conn is None:
+            return None
+        if (conn.closed or conn.get_transaction_status() !=
+                extensions.TRANSACTION_STATUS_IDLE):
+            self._close_in_background(conn)
+            return None
+
+        # The flags above are client-side; the server may have dropped the
+        # connection meanwhile, e.g. for an idle session timeout.
+        try:
+            with conn.cursor() as cur:
+                cur.execute('SELECT 1')
+        except psycopg2.Error as e:
+            logger.debug("Idle connection to %s is gone: %r", db_name, e)
+            self._close_in_background(conn)
+            return None
+        return conn
+
+    def _park_connection(self, db_name, conn):
+        """Keep a connection for a later connect() to its database."""
+        stale = self._idle_connections.pop(db_name, None)
+        if stale is not None:
+            self._close_in_background(stale)
+        self._idle_connections[db_name] = conn
+        while len(self._idle_connections) > self.MAX_IDLE_CONNECTIONS:
+            _, evicted = self._idle_connections.popitem(last=False)
+            self._close_in_background(evicted)
+
+    @staticmethod
+    def _close_in_background(conn):
+        # Closing waits for the server; don't make the user wait too.
+        threading.Thread(
+            target=conn.close, name='redshift_close', daemon=True).start()
+
+    def create_connection(self):
+        """Open a new connection to the current database for the pool."""
+        return self._open_connection(self.database)
+
     def close(self):
         """Close Redshift connection."""
+        with self._iam_lock:
+            if self._iam_timer:
+                self._iam_timer.cancel()
+                self._iam_timer = None
+                self._iam_timer_database = None
+        self.reset_pool()
+        while self._idle_connections:
+            _, conn = self._idle_connections.popitem()
+            conn.close()
         if self.conn:
             self.conn.close()
             self.conn = None
 
+    def cancel(self, cursor):
+        """Cancel the statement running on a cursor's connection.
+
+        Args:
+            cursor: psycopg2 cursor executing in another thread
+        """
+        try:
+            cursor.connection.cancel()
+        except psycopg2.Error as e:
+            logger.debug('Cancelling statement failed: %r', e)
+
     def format_statistics(self, cursor):
         """Format Redshift execution statistics.
 
@@ -220,66 +440,24 @@ class RedshiftBackend(DatabaseBackend):
         # Future enhancement: Query system tables for detailed stats
         return ''
 
-    def tables(self):
-        """Yields fully-qualified table names from current database.
-
-        Overrides base implementation to concatenate schema.table in Python
-        to avoid PostgreSQL quoting issues.
-
-        Yields:
-            tuple: Single-element tuple with schema-qualified table name
-        """
-        with self.get_cursor() as cur:
-            cur.execute(self.TABLES_QUERY)
-            for schema, table in cur:
-                # Concatenate in Python to avoid PostgreSQL adding quotes
-                yield (f"{schema}.{table}",)
-
-    def table_columns(self):
+    def _query_table_columns(self):
         """Yields (table_name, column_name) tuples for current database.
 
-        Overrides base implementation to query all user schemas.
-        Returns schema-qualified table/view names concatenated in Python to avoid
-        PostgreSQL quoting issues.
-        Returns columns for both tables and views to match tables() output.
+        Overrides base implementation to query all user schemas rather than
+        only self.database. Table names are schema-qualified to match
+        tables() output.
         """
-        # Query all user schemas (exclude system schemas)
-        # Join with both pg_tables and pg_views to get columns for tables and views
-        query = '''
-            SELECT c.table_schema, c.table_name, c.column_name
-            FROM information_schema.columns c
-            WHERE c.table_schema NOT IN ('pg_catalog', 'information_schema', 'pg_internal')
-              AND (
-                -- Match tables
-                EXISTS (
-                    SELECT 1 FROM pg_tables t
-                    WHERE c.table_schema = t.schemaname
-                      AND c.table_name = t.tablename
-                )
-                OR
-                -- Match views
-                EXISTS (
-                    SELECT 1 FROM pg_views v
-                    WHERE c.table_schema = v.schemaname
-                      AND c.table_name = v.viewname
-                )
-              )
-            ORDER BY c.table_schema, c.table_name, c.ordinal_position
-        '''
-        with self.get_cursor() as cur:
-            cur.execute(query)
-            for schema, table, column in cur:
-                # Concatenate in Python to avoid PostgreSQL adding quotes
-                yield (f"{schema}.{table}", column)
-
-    def supports_special_command(self, command):
-        """Check if Redshift backend supports a special command.
+        with self.metadata_cursor() as cur:
+            cur.execute(self.TABLE_COLUMNS_QUERY)
+            yield from self.iter_rows(cur)
+
+    def is_batchable(self, sql):
+        """Check if a statement can share an execute() call with others.
 
         Args:
-            command: Special command name
+            sql: Single SQL statement
 
         Returns:
-            bool: False for all commands (Redshift doesn't support Athena-specific features)
+            bool: True for row-less statements allowed in a transaction
         """
-        # Redshift doesn't support Athena-specific features like output_location
-        return False
+        return self.BATCHABLE_RE.match(sql) is not None
@@ -1,5 +1,9 @@
+import queue
 import threading
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from operator import itemgetter
 
 from athenacli.completer import AthenaCompleter
 from athenacli.sqlexecute import SQLExecute
@@ -13,9 +17,17 @@ class CompletionRefresher(object):
 
     refreshers = OrderedDict()
 
+    # Executor metadata calls the refreshers depend on. They are independent
+    # network round trips, so they run concurrently up front and the
+    # refreshers then read them from the backend's metadata cache.
+    prefetched = ('databases', 'tables', 'table_columns')
+
     def __init__(self):
         self._completer_thread = None
-        self._restart_refresh = threading.Event()
+        # Pending refresh requests, consumed by a single long-lived worker.
+        self._requests = queue.Queue()
+        self._lock = threading.Lock()
+        self._busy = False
 
     def refresh(self, executor, callbacks, completer_options=None):
         """Creates a SQLCompleter object and populates it with the relevant
@@ -31,21 +43,43 @@ class CompletionRefresher(object):
         if completer_options is None:
             completer_options = {}
 
-        if self.is_refreshing():
-            self._restart_refresh.set()
+        with self._lock:
+            restarted = self._busy
+            self._busy = True
+            self._requests.put((executor, callbacks, completer_options))
+            if not (self._completer_thread and
+                    self._completer_thread.is_alive()):
+                self._completer_thread = threading.Thread(
+                    target=self._worker, name='completion_refresh',
+                    daemon=True)
+                self._completer_thread.start()
+
+        if restarted:
             return [(None, None, None, 'Auto-completion refresh restarted.')]
-        else:
-            self._completer_thread = threading.Thread(
-                target=self._bg_refresh,
-                args=(executor, callbacks, completer_options),
-                name='completion_refresh')
-            self._completer_thread.setDaemon(True)
-            self._completer_thread.start()
-            return [(None, None, None,
-                     'Auto-completion refresh started in the background.')]
+        return [(None, None, None,
+                 'Auto-completion refresh started in the background.')]
 
     def is_refreshing(self):
-        return self._completer_thread and self._completer_thread.is_alive()
+        return self._busy
+
+    def _worker(self):
+        """Run refresh requests; pending requests collapse into the latest."""
+        while True:
+            request = self._requests.get()
+            while True:
+                try:
+                    request = self._requests.get_nowait()
+                except queue.Empty:
+                    break
+
+            try:
+                self._bg_refresh(*request)
+            except Exception:
+                LOGGER.exception('Auto-completion refresh failed.')
+
+            with self._lock:
+                if self._requests.empty():
+                    self._busy = False
 
     def _bg_refresh(self, sqlexecute, callbacks, completer_options):
         completer = AthenaCompleter(**completer_options)
@@ -58,24 +92,34 @@ class CompletionRefresher(object):
         if callable(callbacks):
             callbacks = [callbacks]
 
-        while 1:
-            for refresher in self.refreshers.values():
-                refresher(completer, executor)
-                if self._restart_refresh.is_set():
-                    self._restart_refresh.clear()
-                    break
-            else:
-                # Break out of while loop if the for loop finishes natually
-                # without hitting the break statement.
-                break
-
-            # Start over the refresh from the beginning if the for loop hit the
-            # break statement.
-            continue
+        self._prefetch(executor)
+        for refresher in self.refreshers.values():
+            refresher(completer, executor)
+            if not self._requests.empty():
+                # A newer refresh request supersedes this one; the worker
+                # starts over with it.
+                return
 
         for callback in callbacks:
             callback(completer)
 
+    def _prefetch(self, executor):
+        """Warm the executor's metadata cache with concurrent queries.
+
+        Errors are only logged here; the refreshers hit them again and handle
+        them as before.
+        """
+        def fetch(name):
+            return list(getattr(executor, name)())
+
+        with ThreadPoolExecutor(max_workers=len(self.prefetched)) as pool:
+            futures = [pool.submit(fetch, name) for name in self.prefetched]
+            for name, future in zip(self.prefetched, futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    LOGGER.debug('Prefetching %s failed: %r', name, e)
+
 
 def refresher(name, refreshers=CompletionRefresher.refreshers):
     """Decorator to add the decorated function to the dictionary of
@@ -109,16 +153,9 @@ def refresh_tables(completer, executor):
     if isinstance(executor.backend, RedshiftBackend):
         # Don't escape Redshift identifiers - they're case-insensitive
         # and schema.table should not be quoted as a single identifier
-        tables_data = list(executor.tables())
-
-        metadata = completer.dbmetadata['tables']
-        for relname_tuple in tables_data:
-            relname = relname_tuple[0]
-            try:
-                metadata[completer.dbname][relname] = ['*']
-            except KeyError:
-                pass
-            completer.all_completions.add(relname)
+        relnames = [row[0] for row in executor.tables()]
+        relations = {relname: ['*'] for relname in relnames}
+        completer.all_completions.update(relnames)
 
         # For columns, also skip escaping
         try:
@@ -126,9 +163,14 @@ def refresh_tables(completer, executor):
         except Exception:
             column_data = []
 
-        for relname, column in column_data:
-            metadata[completer.dbname][relname].append(column)
-            completer.all_completions.add(column)
+        # Rows arrive ordered by table, so each table is a single group.
+        for relname, rows in groupby(column_data, key=itemgetter(0)):
+            relations[relname].extend(map(itemgetter(1), rows))
+        completer.all_completions.update(map(itemgetter(1), column_data))
+
+        metadata = completer.dbmetadata['tables']
+        if completer.dbname in metadata:
+            metadata[completer.dbname].update(relations)
     else:
         # Default behavior for Athena and other backends
         completer.extend_relations(executor.tables(), kind='tables')
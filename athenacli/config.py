@@ -3,6 +3,9 @@ import logging
 import os
 import sys
 import errno
+import hashlib
+import json
+import tempfile
 import boto3
 from configobj import ConfigObj, ConfigObjError
 from collections import defaultdict
@@ -16,11 +19,61 @@ except NameError:
 
 LOGGER = logging.getLogger(__name__)
 
+# boto3 session used to look up the default region; creating one parses the
+# AWS config/credentials files, so it is created once per process.
+_DEFAULT_SESSION = None
+
+
+def _get_default_session():
+    global _DEFAULT_SESSION
+    if _DEFAULT_SESSION is None:
+        _DEFAULT_SESSION = boto3.session.Session()
+    return _DEFAULT_SESSION
+
+
+# Strings accepted as true by AWSConfig boolean settings.
+_TRUE_STRINGS = frozenset(('true', '1', 'yes', 'on', 't', 'y'))
+
+
+def _first(default, *vals):
+    """Return the first truthy value in `vals`, otherwise `default`."""
+    return next((v for v in vals if v), default)
+
+
+def _first_bool(default, *vals):
+    """Return the first non-None value in `vals` as boolean, otherwise `default`."""
+    for v in vals:
+        if v is None:
+            continue
+        if isinstance(v, str):
+            return v.lower() in _TRUE_STRINGS
+        return bool(v)
+    return default
+
+
+def _first_int(default, *vals):
+    """Return the first value in `vals` that parses as int, otherwise `default`."""
+    for v in vals:
+        if v is None:
+            continue
+        try:
+            return int(v)
+        except (ValueError, TypeError):
+            continue
+    return default
+
 
 class AWSConfig(object):
+    __slots__ = (
+        'aws_access_key_id', 'aws_secret_access_key', 'region',
+        's3_staging_dir', 'work_group', 'role_arn', 'result_reuse_enable',
+        'result_reuse_minutes', 'cursor_class',
+    )
+
     def __init__(self, aws_access_key_id, aws_secret_access_key,
                  region, s3_staging_dir, work_group, profile, config,
-                 result_reuse_enable=None, result_reuse_minutes=None):
+                 result_reuse_enable=None, result_reuse_minutes=None,
+                 cursor_class=None):
         key = 'aws_profile %s' % profile
         try:
             _cfg = config[key]
@@ -30,47 +83,35 @@ class AWSConfig(object):
             # which the login fails if we set aws_access_key_id/aws_secret_access_key here
             _cfg = defaultdict(lambda: None)
 
-        self.aws_access_key_id = self.get_val(aws_access_key_id, _cfg['aws_access_key_id'])
-        self.aws_secret_access_key = self.get_val(aws_secret_access_key, _cfg['aws_secret_access_key'])
-        self.region = self.get_val(region, _cfg['region'], self.get_region())
-        self.s3_staging_dir = self.get_val(s3_staging_dir, _cfg['s3_staging_dir'])
-        self.work_group = self.get_val(work_group, _cfg['work_group'])
+        self.aws_access_key_id = _first(None, aws_access_key_id, _cfg['aws_access_key_id'])
+        self.aws_secret_access_key = _first(None, aws_secret_access_key, _cfg['aws_secret_access_key'])
+        # only fall back to the boto3 lookup if the region isn't configured
+        self.region = _first(None, region, _cfg['region']) or self.get_region()
+        self.s3_staging_dir = _first(None, s3_staging_dir, _cfg['s3_staging_dir'])
+        self.work_group = _first(None, work_group, _cfg['work_group'])
         # enable connection to assume role
-        self.role_arn = self.get_val(_cfg.get('role_arn'))
+        self.role_arn = _first(None, _cfg.get('role_arn'))
         # query result reuse settings
-        self.result_reuse_enable = self.get_bool(result_reuse_enable, _cfg.get('result_reuse_enable'), False)
-        self.result_reuse_minutes = self.get_int(result_reuse_minutes, _cfg.get('result_reuse_minutes'), 60)
+        self.result_reuse_enable = _first_bool(False, result_reuse_enable, _cfg.get('result_reuse_enable'))
+        self.result_reuse_minutes = _first_int(60, result_reuse_minutes, _cfg.get('result_reuse_minutes'))
+        # cursor used for query results: default, pandas or arrow
+        self.cursor_class = _first('default', cursor_class, _cfg.get('cursor_class'))
 
     def get_val(self, *vals):
         """Return the first True value in `vals` list, otherwise return None."""
-        for v in vals:
-            if v:
-                return v
+        return _first(None, *vals)
 
     def get_bool(self, *vals):
         """Return the first non-None value as boolean, with string parsing support."""
-        for v in vals:
-            if v is not None:
-                if isinstance(v, bool):
-                    return v
-                if isinstance(v, str):
-                    return v.lower() in ('true', '1', 'yes', 'on')
-                return bool(v)
-        return False
+        return _first_bool(False, *vals)
 
     def get_int(self, *vals):
         """Return the first non-None value as int, with string parsing support."""
-        for v in vals:
-            if v is not None:
-                try:
-                    return int(v)
-                except (ValueError, TypeError):
-                    continue
-        return 60  # default
+        return _first_int(60, *vals)
 
     def get_region(self):
         """Try to get region name from aws credentials/config files or environment variables"""
-        return boto3.session.Session().region_name
+        return _get_default_session().region_name
 
 
 def log(logger, level, message):
@@ -103,16 +144,142 @@ def read_config_file(f):
     return config
 
 
-def read_config_files(files):
-    """Read and merge a list of config files."""
+# Directory of the JSON files caching the parsed values of config files.
+CONFIG_CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or '~/.cache', 'athenacli', 'config')
+
+
+def _config_cache_path(path):
+    """Path of the cache file for a config file, None if not cached.
+
+    Default config files shipped inside a package are parsed every time
+    rather than leaving cache files there.
+    """
+    path = os.path.abspath(path)
+    if os.path.exists(os.path.join(os.path.dirname(path), '__init__.py')):
+        return None
+    name = hashlib.sha1(path.encode('utf8')).hexdigest() + '.json'
+    return os.path.join(os.path.expanduser(CONFIG_CACHE_DIR), name)
+
+
+def _read_config_values(f):
+    """Read a config file's values as nested dicts.
 
-    config = ConfigObj()
+    The values of a config file given by path are cached in a JSON file in
+    CONFIG_CACHE_DIR, so unchanged files aren't parsed again on startup.
+    """
 
+    if not isinstance(f, basestring):
+        config = read_config_file(f)
+        return config.dict() if config else None
+
+    path = os.path.expanduser(f)
+    cache_path = _config_cache_path(path)
+    key = None
+    if cache_path is not None:
+        try:
+            stat = os.stat(path)
+            key = [path, stat.st_mtime_ns, stat.st_size]
+        except OSError:
+            pass
+
+    if key is not None:
+        try:
+            with open(cache_path, encoding='utf8') as cache:
+                cached = json.load(cache)
+            if cached['key'] == key:
+                return cached['values']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    try:
+        values = ConfigObj(path, interpolation=False, encoding='utf8').dict()
+    except (ConfigObjError, IOError, OSError):
+        # let read_config_file() report the problem
+        config = read_config_file(path)
+        return config.dict() if config else None
+
+    if key is not None:
+        _write_config_cache(cache_path, {'key': key, 'values': values})
+    return values
+
+
+def _write_config_cache(cache_path, data):
+    """Atomically write a config cache file, ignoring failures."""
+    try:
+        mkdir_p(os.path.dirname(cache_path))
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(cache_path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf8') as tmp:
+                json.dump(data, tmp)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        LOGGER.debug('Unable to write config cache %r: %r', cache_path, e)
+
+
+def _merge_values(target, values):
+    """Recursively merge nested dicts, like ConfigObj.merge()."""
+    for key, value in values.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge_values(target[key], value)
+        else:
+            target[key] = value
+
+
+# Merged values of read_config_files() calls, keyed by their files' paths
+# and modification times.
+_merged_config_cache = {}
+
+
+def _config_files_key(files):
+    """Cache key for a list of config file paths, None if not cacheable."""
+    key = []
     for _file in files:
-        _config = read_config_file(_file)
-        if bool(_config) is True:
-            config.merge(_config)
-            config.filename = _config.filename
+        if not isinstance(_file, basestring):
+            return None
+        path = os.path.expanduser(_file)
+        try:
+            key.append((path, os.stat(path).st_mtime_ns))
+        except OSError:
+            key.append((path, None))
+    return tuple(key)
+
+
+def read_config_files(files):
+    """Read and merge a list of config files.
+
+    Merged values are kept for the process, so reading the same unchanged
+    files again only stats them.
+    """
+
+    key = _config_files_key(files)
+    cached = _merged_config_cache.get(key) if key is not None else None
+
+    if cached is None:
+        values = {}
+        filename = None
+
+        for _file in files:
+            _values = _read_config_values(_file)
+            if bool(_values) is True:
+                _merge_values(values, _values)
+                filename = (os.path.expanduser(_file)
+                            if isinstance(_file, basestring) else None)
+
+        cached = values, filename
+        if key is not None:
+            if len(_merged_config_cache) >= 16:
+                _merged_config_cache.clear()
+            _merged_config_cache[key] = cached
+
+    values, filename = cached
+    # a new ConfigObj per call; its sections are copies of the cached values
+    config = ConfigObj(values, interpolation=False, encoding='utf8')
+    config.filename = filename
 
     return config
 
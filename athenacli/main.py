@@ -2,7 +2,6 @@
 import os
 import shutil
 import sys
-import select
 import click
 import threading
 import logging
@@ -62,7 +61,9 @@ class AthenaCli(object):
 
     def __init__(self, region, aws_access_key_id, aws_secret_access_key,
                  s3_staging_dir, work_group, athenaclirc, profile, database,
-                 result_reuse_enable=None, result_reuse_minutes=None):
+                 result_reuse_enable=None, result_reuse_minutes=None,
+                 cursor_class=None, async_pipeline=False):
+        self.async_pipeline = async_pipeline
 
         config_files = [DEFAULT_CONFIG_FILE]
         if os.path.exists(os.path.expanduser(athenaclirc)):
@@ -73,7 +74,7 @@ class AthenaCli(object):
 
         aws_config = AWSConfig(
             aws_access_key_id, aws_secret_access_key, region, s3_staging_dir, work_group, profile, _cfg,
-            result_reuse_enable, result_reuse_minutes
+            result_reuse_enable, result_reuse_minutes, cursor_class
         )
 
         try:
@@ -105,9 +106,11 @@ For more details about the error, you can check the log file: %s''' % (athenacli
         self.cli_style = _cfg['colors']
         self.output_style = style_factory_output(self.syntax_style, self.cli_style)
 
-        self.completer = AthenaCompleter()
+        # Completion is only needed by the interactive prompt, see
+        # init_completion().
+        self.completer = None
         self._completer_lock = threading.Lock()
-        self.completion_refresher = CompletionRefresher()
+        self.completion_refresher = None
 
         self.prompt_app = None
 
@@ -204,9 +207,10 @@ For more details about the error, you can check the log file: %s''' % (athenacli
             role_arn = aws_config.role_arn,
             database = database,
             result_reuse_enable = aws_config.result_reuse_enable,
-            result_reuse_minutes = aws_config.result_reuse_minutes
+            result_reuse_minutes = aws_config.result_reuse_minutes,
+            cursor_class = aws_config.cursor_class
         )
-        self.sqlexecute = SQLExecute(backend)
+        self.sqlexecute = SQLExecute(backend, async_pipeline=self.async_pipeline)
 
     def handle_editor_command(self, text):
         """
@@ -253,9 +257,21 @@ For more details about the error, you can check the log file: %s''' % (athenacli
             for line in output:
                 click.echo(line, nl=new_line)
 
+    def init_completion(self):
+        """Create the completer and its refresher on first use.
+
+        Queries given with --execute never use them, so they are not built
+        up front.
+        """
+        if self.completer is None:
+            self.completer = AthenaCompleter()
+        if self.completion_refresher is None:
+            self.completion_refresher = CompletionRefresher()
+
     def run_cli(self):
         self.iterations = 0
         self.configure_pager()
+        self.init_completion()
         self.refresh_completions()
 
         history_file = os.path.expanduser(self.config['main']['history_file'])
@@ -304,14 +320,19 @@ For more details about the error, you can check the log file: %s''' % (athenacli
                 result_count = 0
 
                 for title, rows, headers, status in res:
-                    if rows and len(rows) > threshold:
-                        self.echo(
-                            'The result set has more than {} rows.'.format(threshold),
-                            fg='red'
-                        )
-                        if not confirm('Do you want to continue?'):
-                            self.echo('Aborted!', err=True, fg='red')
-                            break
+                    if rows is not None:
+                        # Rows are streamed; only fetch enough to warn.
+                        rows = iter(rows)
+                        head = list(itertools.islice(rows, threshold + 1))
+                        if len(head) > threshold:
+                            self.echo(
+                                'The result set has more than {} rows.'.format(threshold),
+                                fg='red'
+                            )
+                            if not confirm('Do you want to continue?'):
+                                self.echo('Aborted!', err=True, fg='red')
+                                break
+                        rows = itertools.chain(head, rows)
 
                     formatted = self.format_output(
                         title, rows, headers, special.is_expanded_output(), None
@@ -333,7 +354,7 @@ For more details about the error, you can check the log file: %s''' % (athenacli
 
                     start = time()
                     result_count += 1
-                    mutating = mutating or is_mutating(status)
+                    mutating = mutating or is_mutating(resolve_status(status))
                 special.unset_once_if_written()
             except EOFError as e:
                 raise e
@@ -353,7 +374,7 @@ For more details about the error, you can check the log file: %s''' % (athenacli
             else:
                 # Refresh the table names and column names if necessary.
                 if need_completion_refresh(text):
-                    self.refresh_completions()
+                    self.refresh_completions(reset=True)
 
             query = Query(text, successful, mutating)
             self.query_history.append(query)
@@ -386,7 +407,9 @@ For more details about the error, you can check the log file: %s''' % (athenacli
         if output:
             size = self.prompt_app.output.get_size()
 
-            margin = self.get_output_margin(status)
+            # The row count may still change while output is consumed, but
+            # not the number of status lines.
+            margin = self.get_output_margin(resolve_status(status))
 
             fits = True
             buf = []
@@ -420,6 +443,7 @@ For more details about the error, you can check the log file: %s''' % (athenacli
                     for line in buf:
                         click.secho(line)
 
+        status = resolve_status(status)
         if status:
             click.secho(status)
 
@@ -444,11 +468,12 @@ For more details about the error, you can check the log file: %s''' % (athenacli
         if title:  # Only print the title if it's not None.
             output = itertools.chain(output, [title])
 
-        if cur:
-            column_types = None
-            if hasattr(cur, 'description'):
-                column_types = [str for col in cur.description]
+        column_types = None
+        if hasattr(cur, 'description'):
+            column_types = [str for col in cur.description]
 
+        cur = skip_empty_rows(cur)
+        if cur:
             if max_width is not None:
                 cur = list(cur)
 
@@ -482,7 +507,15 @@ For more details about the error, you can check the log file: %s''' % (athenacli
         """
         click.secho(s, **kwargs)
 
-    def refresh_completions(self):
+    def refresh_completions(self, reset=False):
+        """Refresh the completions in the background.
+
+        reset - drop the backend's cached metadata first, e.g. after a
+                statement that created or dropped tables.
+        """
+        if reset:
+            self.sqlexecute.backend.invalidate_metadata_cache()
+
         with self._completer_lock:
             self.completer.reset_completions()
 
@@ -603,6 +636,39 @@ def need_completion_refresh(queries):
             return False
 
 
+def resolve_status(status):
+    """Returns the status text of a result.
+
+    Result sets have a callable status reporting the rows fetched so far.
+    """
+    return status() if callable(status) else status
+
+
+def skip_empty_rows(rows):
+    """Returns None for a rows iterator without rows, otherwise *rows*."""
+    if rows is None or isinstance(rows, (list, tuple)):
+        return rows
+    rows = iter(rows)
+    try:
+        first = next(rows)
+    except StopIteration:
+        return None
+    return itertools.chain([first], rows)
+
+
+def read_stdin_query(stdin=None):
+    """Returns the query piped to stdin for ``--execute -``.
+
+    The read blocks until the writer closes the pipe, so a slow producer
+    cannot be mistaken for an empty one. A terminal has no piped query.
+    """
+    stdin = stdin or sys.stdin
+    query = '' if stdin.isatty() else stdin.read()
+    if not query.strip():
+        raise RuntimeError("No query to execute on stdin")
+    return query
+
+
 def is_mutating(status):
     """Determines if the statement is mutating based on the status."""
     if not status:
@@ -623,11 +689,16 @@ def is_mutating(status):
 @click.option('--profile', type=str, help='AWS profile (defaults to AWS_PROFILE env var or "default")')
 @click.option('--result-reuse-enable', is_flag=True, default=None, help='Enable query result reuse (requires Athena engine version 3)')
 @click.option('--result-reuse-minutes', type=int, help='TTL for query result reuse in minutes (default: 60)')
+@click.option('--cursor-class', type=click.Choice(['default', 'pandas', 'arrow']),
+              help='Cursor used to fetch query results. pandas/arrow download results from S3 in bulk (requires pandas/pyarrow).')
+@click.option('--async-pipeline', is_flag=True,
+              help='Run the next read-only statement of a multi-statement query while the results of the previous one are shown.')
 @click.option('--table-format', type=str, default='csv', help='Table format used with -e option.')
 @click.argument('database', default='default', nargs=1)
 def cli(execute, region, aws_access_key_id, aws_secret_access_key,
         s3_staging_dir, work_group, athenaclirc, profile, result_reuse_enable,
-        result_reuse_minutes, table_format, database):
+        result_reuse_minutes, cursor_class, async_pipeline, table_format,
+        database):
     '''A Athena terminal client with auto-completion and syntax highlighting.
 
     \b
@@ -661,16 +732,15 @@ def cli(execute, region, aws_access_key_id, aws_secret_access_key,
         profile=profile,
         result_reuse_enable=result_reuse_enable,
         result_reuse_minutes=result_reuse_minutes,
+        cursor_class=cursor_class,
+        async_pipeline=async_pipeline,
         database=database
     )
 
     #  --execute argument
     if execute:
         if execute == '-':
-            if select.select([sys.stdin, ], [], [], 0.0)[0]:
-                query = sys.stdin.read()
-            else:
-                raise RuntimeError("No query to execute on stdin")
+            query = read_stdin_query()
         elif os.path.exists(execute):
             with open(execute) as f:
                 query = f.read()
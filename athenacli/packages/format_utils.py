@@ -1,18 +1,30 @@
 # -*- coding: utf-8 -*-
 
+SIZE_SUFFIXES = ('B', 'KB', 'MB', 'GB', 'TB')
 
-def format_status(rows_length=None, cursor=None, backend=None):
+ROW_IN_SET = ' row in set'
+ROWS_IN_SET = ' rows in set'
+
+
+def format_status(rows_length=None, cursor=None, backend=None,
+                  row_count_callback=None):
     """Format query status including row count and backend-specific statistics.
 
     Args:
         rows_length: Number of rows returned
         cursor: Database cursor after query execution
         backend: DatabaseBackend instance for backend-specific formatting
+        row_count_callback: Callable returning the number of rows, used
+            instead of rows_length for streamed results
 
     Returns:
         str: Formatted status message
     """
-    return rows_status(rows_length) + statistics(cursor, backend)
+    if row_count_callback is not None:
+        rows_length = row_count_callback()
+    if cursor and backend and backend.HAS_STATISTICS:
+        return rows_status(rows_length) + backend.format_statistics(cursor)
+    return rows_status(rows_length)
 
 
 def rows_status(rows_length):
@@ -25,7 +37,7 @@ def rows_status(rows_length):
         str: Row count message
     """
     if rows_length:
-        return '%d row%s in set' % (rows_length, '' if rows_length == 1 else 's')
+        return str(rows_length) + (ROW_IN_SET if rows_length == 1 else ROWS_IN_SET)
     else:
         return 'Query OK'
 
@@ -40,7 +52,22 @@ def statistics(cursor, backend=None):
     Returns:
         str: Formatted statistics (may be empty for some backends)
     """
-    if cursor and backend:
+    if cursor and backend and backend.HAS_STATISTICS:
         return backend.format_statistics(cursor)
     else:
         return ''
+
+
+def humanize_size(num_bytes):
+    """Convert bytes to human-readable format.
+
+    Args:
+        num_bytes: Number of bytes
+
+    Returns:
+        str: Human-readable size (e.g., '1.5 GB')
+    """
+    # Each suffix step is 10 bits, so the magnitude follows from bit_length.
+    index = min((num_bytes.bit_length() - 1) // 10, len(SIZE_SUFFIXES) - 1) if num_bytes > 0 else 0
+    num = ('%.2f' % (num_bytes / (1 << (index * 10)))).rstrip('0').rstrip('.')
+    return '%s %s' % (num, SIZE_SUFFIXES[index])
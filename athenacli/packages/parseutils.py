@@ -198,6 +198,23 @@ def queries_start_with(queries, prefixes):
     return False
 
 
+READ_ONLY_KEYWORDS = frozenset(('select', 'with', 'values', 'show', 'desc',
+                                'describe', 'explain'))
+
+# First word of a statement, skipping leading whitespace and comments.
+_FIRST_WORD_RE = re.compile(
+    r'(?:\s|--[^\n]*(?:\n|$)|#[^\n]*(?:\n|$)|/\*.*?\*/)*(\w+)', re.S)
+
+
+def is_read_only(query):
+    """Returns if *query* only reads data, e.g. SELECT or SHOW."""
+    match = _FIRST_WORD_RE.match(query)
+    if match:
+        return match.group(1).lower() in READ_ONLY_KEYWORDS
+    # e.g. unterminated comments: let sqlparse decide
+    return query_starts_with(query, READ_ONLY_KEYWORDS)
+
+
 def is_destructive(queries):
     """Returns if any of the queries in *queries* is destructive."""
     keywords = ('drop', 'shutdown', 'delete', 'truncate')
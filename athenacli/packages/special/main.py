@@ -47,6 +47,15 @@ def register_special_command(handler, command, shortcut, description,
                                        arg_type, case_sensitive=case_sensitive,
                                        hidden=True)
 
+@export
+def is_special_command(sql):
+    """Returns if *sql* is a special command, i.e. handled by execute()."""
+    command, _, _ = parse_special_command(sql)
+    if command in COMMANDS:
+        return True
+    special_cmd = COMMANDS.get(command.lower())
+    return special_cmd is not None and not special_cmd.case_sensitive
+
 @export
 def execute(cur, sql):
     """Execute a special command and return the results. If the special command
@@ -1,13 +1,43 @@
 # encoding: utf-8
 
+import functools
 import logging
-import sqlparse
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+
+from sqlparse.engine import FilterStack
 
 from athenacli.packages import special
+from athenacli.packages.parseutils import is_read_only
 from athenacli.packages.format_utils import format_status
 
 logger = logging.getLogger(__name__)
 
+# Name of a cursor.description entry.
+_column_name = itemgetter(0)
+
+
+def _split_statements(sql):
+    """Yields the statements of *sql* like sqlparse.split(), one at a time.
+
+    Only the statement being split is held as tokens, rather than the
+    whole script.
+    """
+    for stmt in FilterStack().run(sql):
+        yield str(stmt).strip()
+
+
+def _clean(sql):
+    """Returns (sql, expanded) for a split statement.
+
+    Trailing spaces, eol and semi-colons are removed. \\G is treated
+    specially since we have to set the expanded output.
+    """
+    sql = sql.rstrip(' \t\r\n;')
+    if sql.endswith('\\G'):
+        return sql[:-2].rstrip(), True
+    return sql, False
+
 
 class SQLExecute(object):
     """SQL execution wrapper that uses a database backend abstraction.
@@ -16,14 +46,26 @@ class SQLExecute(object):
     regardless of the underlying database backend (Athena, Redshift, etc.).
     """
 
-    def __init__(self, backend):
+    __slots__ = ('backend', 'async_pipeline', 'batch_statements', 'database',
+                 '_supports_output_location', '_cursor_has_output_location')
+
+    def __init__(self, backend, async_pipeline=False, batch_statements=False):
         """Initialize SQLExecute with a database backend.
 
         Args:
             backend: DatabaseBackend instance (AthenaBackend, RedshiftBackend, etc.)
+            async_pipeline: Execute the next statement of a multi-statement
+                run while the results of the current one are consumed
+            batch_statements: Send consecutive statements without results
+                in one execute() call if the backend supports it
         """
         self.backend = backend
+        self.async_pipeline = async_pipeline
+        self.batch_statements = batch_statements
         self.database = backend.database
+        # Athena-specific; neither the backend nor its cursor class changes.
+        self._supports_output_location = backend.supports_special_command('output_location')
+        self._cursor_has_output_location = None
 
     def connect(self, database=None):
         """Connect to database using the backend.
@@ -49,52 +91,201 @@ class SQLExecute(object):
 
         The results are a list of tuples. Each tuple has 4 values
         (title, rows, headers, status).
+
+        For result sets, rows is an iterator fetching the rows in batches
+        and status a callable returning the status for the rows fetched so
+        far, see get_result().
         '''
         # Remove spaces and EOL
         statement = statement.strip()
         if not statement:  # Empty string
             yield (None, None, None, None)
+            return
+
+        # Split the sql into separate queries and run each one as it is
+        # split. A statement whose only semicolon is the terminating one
+        # needs no parsing.
+        semicolons = statement.count(';')
+        if semicolons == 0 or (semicolons == 1 and statement.endswith(';')):
+            components = [statement]
+        else:
+            components = _split_statements(statement)
+
+        steps = self._steps(components)
+        if self.async_pipeline:
+            yield from self._run_pipelined(steps)
+            return
 
-        # Split the sql into separate queries and run each one.
-        components = sqlparse.split(statement)
+        # Statements share a cursor until one returns a result set, whose
+        # rows are still to be fetched from it, or a special command runs.
+        # Those can switch databases (use), which cursors don't follow.
+        cur = None
+        for step in steps:
+            if step[0] == 'special':
+                cur = None
+                yield from self._run_step(step)
+                continue
+            cur = self._execute_step(step, cur)
+            reusable = cur.description is None
+            yield from self._step_results(step, cur)
+            if not reusable:
+                cur = None
+
+    def _steps(self, components):
+        '''Yields (kind, sql, expanded) steps for the split statements.
+
+        kind is 'special' for special commands, 'sql' for other statements
+        and 'batch' for a list of statements without results, executed in a
+        single execute() call. A batch runs in one implicit transaction: if
+        one statement fails, none has any effect.
+        '''
+        batching = (self.batch_statements and
+                    self.backend.SUPPORTS_MULTI_STATEMENT)
+        batch = []
 
         for sql in components:
-            # Remove spaces, eol and semi-colons.
-            sql = sql.rstrip(';')
+            sql, expanded = _clean(sql)
+
+            # Consecutive statements without results are sent together.
+            if batching and not expanded and self.backend.is_batchable(sql):
+                batch.append(sql)
+                continue
+            if batch:
+                yield ('batch', batch, False)
+                batch = []
 
-            # \G is treated specially since we have to set the expanded output.
-            if sql.endswith('\\G'):
-                special.set_expanded_output(True)
-                sql = sql[:-2].strip()
+            kind = 'special' if special.is_special_command(sql) else 'sql'
+            yield (kind, sql, expanded)
 
-            cur = self.backend.get_cursor()
+        if batch:
+            yield ('batch', batch, False)
 
-            try:
-                for result in special.execute(cur, sql):
-                    yield result
-            except special.CommandNotFound:  # Regular SQL
-                cur.execute(sql)
-                yield self.get_result(cur)
+    def _run_step(self, step):
+        '''Execute a step and yield its results.'''
+        kind, sql, expanded = step
+        if kind != 'special':
+            yield from self._step_results(step, self._execute_step(step))
+            return
+
+        if expanded:
+            special.set_expanded_output(True)
+        for result in special.execute(self._new_cursor(), sql):
+            yield result
+
+    def _new_cursor(self):
+        '''Get a cursor for user statements.'''
+        cur = self.backend.get_query_cursor()
+        cur.arraysize = self.backend.fetch_size
+        return cur
+
+    def _execute_step(self, step, cur=None):
+        '''Execute a 'sql' or 'batch' step and return its cursor.
+
+        A new cursor is used unless *cur* is given.
+        '''
+        kind, sql, _ = step
+        if cur is None:
+            cur = self._new_cursor()
+        if kind == 'batch':
+            # A statement can end in a -- comment, so the separator gets a
+            # line of its own.
+            sql = '\n;\n'.join(sql)
+        self.backend.execute(cur, sql)
+        return cur
+
+    def _step_results(self, step, cur):
+        '''Yields the results of an executed 'sql' or 'batch' step.'''
+        kind, sql, expanded = step
+        if expanded:
+            special.set_expanded_output(True)
+        result = self.get_result(cur)
+        for _ in (sql if kind == 'batch' else (sql,)):
+            yield result
+
+    def _run_pipelined(self, steps):
+        '''Run steps, executing the next read-only statement in the
+        background while the results of the current one are consumed.
+
+        Any other step runs on the calling thread once its results are asked
+        for. A caller stopping early therefore doesn't leave a write
+        executed, and Ctrl-C reaches the query being waited for. Special
+        commands are barriers: they run on their own, after the statements
+        before them.
+        '''
+        pool = ThreadPoolExecutor(max_workers=1)
+        # (future, cursor) of the next step, executing in the background
+        ahead = None
+        try:
+            steps = iter(steps)
+            step = next(steps, None)
+            while step is not None:
+                if step[0] == 'special':
+                    yield from self._run_step(step)
+                    step = next(steps, None)
+                    continue
+
+                if ahead is not None:
+                    cur = ahead[0].result()
+                    ahead = None
+                else:
+                    cur = self._execute_step(step)
+
+                next_step = next(steps, None)
+                if (next_step is not None and next_step[0] == 'sql' and
+                        is_read_only(next_step[1])):
+                    ahead_cur = self._new_cursor()
+                    ahead = (pool.submit(self._execute_step, next_step, ahead_cur),
+                             ahead_cur)
+
+                yield from self._step_results(step, cur)
+                step = next_step
+        except BaseException:
+            # e.g. Ctrl-C or the caller closing the generator: the statement
+            # executing ahead is no longer wanted.
+            if ahead is not None:
+                future, ahead_cur = ahead
+                if not future.cancel() and not future.done():
+                    self.backend.cancel(ahead_cur)
+            pool.shutdown(wait=False)
+            raise
+        pool.shutdown()
 
     def get_result(self, cursor):
-        '''Get the current result's data from the cursor.'''
+        '''Get the current result's data from the cursor.
+
+        Rows of result sets are streamed rather than fetched up front, so
+        their status is a callable to call once the rows are consumed.
+        '''
         title = headers = None
 
         # Set output location if backend supports it (Athena-specific)
-        if self.backend.supports_special_command('output_location') and hasattr(cursor, 'output_location'):
-            special.set_output_location(cursor.output_location)
+        if self._supports_output_location:
+            if self._cursor_has_output_location is None:
+                self._cursor_has_output_location = hasattr(cursor, 'output_location')
+            if self._cursor_has_output_location:
+                special.set_output_location(cursor.output_location)
 
         # cursor.description is not None for queries that return result sets,
         # e.g. SELECT or SHOW.
         if cursor.description is not None:
-            headers = [x[0] for x in cursor.description]
-            rows = cursor.fetchall()
-            status = format_status(rows_length=len(rows), cursor=cursor, backend=self.backend)
-        else:
-            logger.debug('No rows in result.')
-            rows = None
-            status = format_status(rows_length=None, cursor=cursor, backend=self.backend)
-        return (title, rows, headers, status)
+            headers = list(map(_column_name, cursor.description))
+            row_count = 0
+
+            def rows():
+                nonlocal row_count
+                for batch in self.backend.iter_batches(cursor):
+                    row_count += len(batch)
+                    yield from batch
+
+            status = functools.partial(
+                format_status, cursor=cursor, backend=self.backend,
+                row_count_callback=lambda: row_count)
+
+            return (title, rows(), headers, status)
+
+        logger.debug('No rows in result.')
+        status = format_status(rows_length=None, cursor=cursor, backend=self.backend)
+        return (title, None, headers, status)
 
     def tables(self):
         '''Yields table names.'''
@@ -1,12 +1,47 @@
 # encoding: utf-8
 """Redshift-specific configuration handling."""
 
+import functools
 import os
+import sys
+
+from athenacli.config import _first
+
+# RedshiftConfig settings: (name, environment variables, default). Values
+# come from the CLI, then the config file, the environment and the default.
+_SPEC = (
+    ('host', ('REDSHIFT_HOST', 'PGHOST'), None),
+    ('port', ('REDSHIFT_PORT', 'PGPORT'), 5439),
+    ('database', ('REDSHIFT_DATABASE', 'PGDATABASE'), 'dev'),
+    ('user', ('REDSHIFT_USER', 'PGUSER', 'USER'), None),
+    ('password', ('REDSHIFT_PASSWORD', 'PGPASSWORD'), None),
+    ('sslmode', ('PGSSLMODE',), 'prefer'),
+    # AWS profile and region are used for IAM authentication
+    ('aws_profile', ('AWS_PROFILE',), 'default'),
+    ('region', ('AWS_DEFAULT_REGION',), 'us-east-1'),
+)
+
+# Settings with few distinct values, interned so configs share them.
+_INTERNED = frozenset(('user', 'sslmode', 'aws_profile', 'region'))
+
+# Environment variables RedshiftConfig falls back to.
+_ENV_KEYS = tuple(key for _, env_keys, _ in _SPEC for key in env_keys)
+
+
+@functools.lru_cache(maxsize=None)
+def _env_snapshot():
+    """Read the environment variables once per process.
+
+    Call _env_snapshot.cache_clear() to pick up changes.
+    """
+    return {key: os.environ.get(key) for key in _ENV_KEYS}
 
 
 class RedshiftConfig:
     """Configuration for Redshift connection."""
 
+    __slots__ = tuple(name for name, _, _ in _SPEC) + ('fetch_size', '_repr')
+
     def __init__(self, host, port, database, user, password, sslmode, aws_profile, region, config):
         """Initialize Redshift configuration.
 
@@ -29,80 +64,42 @@ class RedshiftConfig:
             profile_section = 'main'
 
         cfg = config.get(profile_section, config.get('main', {}))
+        env = _env_snapshot()
+
+        cli = {
+            'host': host, 'port': port, 'database': database, 'user': user,
+            'password': password, 'sslmode': sslmode,
+            'aws_profile': aws_profile, 'region': region,
+        }
+        for name, env_keys, default in _SPEC:
+            value = _first(default, cli[name], cfg.get(name),
+                           *(env[key] for key in env_keys))
+            if name in _INTERNED and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, name, value)
 
-        # Host
-        self.host = (
-            host or
-            cfg.get('host') or
-            os.environ.get('REDSHIFT_HOST') or
-            os.environ.get('PGHOST')
-        )
-
-        # Port
-        self.port = (
-            port or
-            cfg.get('port') or
-            os.environ.get('REDSHIFT_PORT') or
-            os.environ.get('PGPORT') or
-            5439
-        )
         if isinstance(self.port, str):
             self.port = int(self.port)
 
-        # Database
-        self.database = (
-            database or
-            cfg.get('database') or
-            os.environ.get('REDSHIFT_DATABASE') or
-            os.environ.get('PGDATABASE') or
-            'dev'
-        )
-
-        # User
-        self.user = (
-            user or
-            cfg.get('user') or
-            os.environ.get('REDSHIFT_USER') or
-            os.environ.get('PGUSER') or
-            os.environ.get('USER')
-        )
-
-        # Password
-        self.password = (
-            password or
-            cfg.get('password') or
-            os.environ.get('REDSHIFT_PASSWORD') or
-            os.environ.get('PGPASSWORD')
-        )
-
-        # SSL mode
-        self.sslmode = (
-            sslmode or
-            cfg.get('sslmode') or
-            os.environ.get('PGSSLMODE') or
-            'prefer'
-        )
-
-        # AWS Profile (for IAM authentication)
-        self.aws_profile = (
-            aws_profile or
-            cfg.get('aws_profile') or
-            os.environ.get('AWS_PROFILE') or
-            'default'
-        )
-
-        # AWS Region
-        self.region = (
-            region or
-            cfg.get('region') or
-            os.environ.get('AWS_DEFAULT_REGION') or
-            'us-east-1'
-        )
+        # Rows fetched per round trip
+        try:
+            self.fetch_size = int(config.get('main', {}).get('fetch_size'))
+        except (TypeError, ValueError):
+            self.fetch_size = None
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name != '_repr':
+            # Settings changed, rebuild the repr on the next call
+            super().__setattr__('_repr', None)
 
     def __repr__(self):
-        return (
-            f'RedshiftConfig(host={self.host}, port={self.port}, '
-            f'database={self.database}, user={self.user}, '
-            f'password={"***" if self.password else None}, sslmode={self.sslmode}, '
-            f'aws_profile={self.aws_profile}, region={self.region})'
-        )
+        if self._repr is None:
+            self._repr = (
+                f'RedshiftConfig(host={self.host}, port={self.port}, '
+                f'database={self.database}, user={self.user}, '
+                f'password={"***" if self.password else None}, sslmode={self.sslmode}, '
+                f'aws_profile={self.aws_profile}, region={self.region}, '
+                f'fetch_size={self.fetch_size})'
+            )
+        return self._repr
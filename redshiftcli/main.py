@@ -2,20 +2,30 @@
 """Main entry point for redshiftcli."""
 
 import os
+import re
 import sys
-import select
+import threading
+from datetime import datetime
+
 import click
+from cli_helpers.tabular_output import TabularOutputFormatter
 
-from athenacli.main import AthenaCli as BaseAthenaCli
+from athenacli.main import AthenaCli as BaseAthenaCli, read_stdin_query
 from athenacli.sqlexecute import SQLExecute
 from athenacli.backends import RedshiftBackend
 from athenacli.config import read_config_files, write_default_config
+from athenacli.packages import special
+from athenacli.packages.tabular_output import sql_format
+from athenacli.clistyle import style_factory_output
 from redshiftcli.config import RedshiftConfig
 
 PACKAGE_ROOT = os.path.abspath(os.path.dirname(__file__))
 REDSHIFTCLIRC = '~/.redshiftcli/redshiftclirc'
 DEFAULT_CONFIG_FILE = os.path.join(PACKAGE_ROOT, 'redshiftclirc')
 
+# Redshift-specific prompt placeholders, see RedshiftCli.get_prompt().
+PROMPT_PLACEHOLDER_RE = re.compile(r'\\[hput]')
+
 
 class RedshiftCli(BaseAthenaCli):
     """Redshift CLI - extends AthenaCli with Redshift-specific configuration."""
@@ -23,7 +33,8 @@ class RedshiftCli(BaseAthenaCli):
     DEFAULT_PROMPT = '\\d@\\h> '
 
     def __init__(self, host, port, database, user, password, sslmode,
-                 aws_profile, region, redshiftclirc):
+                 aws_profile, region, redshiftclirc, async_pipeline=False,
+                 batch_statements=False):
         """Initialize RedshiftCli.
 
         Args:
@@ -36,7 +47,12 @@ class RedshiftCli(BaseAthenaCli):
             aws_profile: AWS profile for IAM authentication
             region: AWS region
             redshiftclirc: Path to config file
+            async_pipeline: Run statements while previous results are shown
+            batch_statements: Send consecutive statements without results in
+                one round trip
         """
+        self.async_pipeline = async_pipeline
+        self.batch_statements = batch_statements
         config_files = [DEFAULT_CONFIG_FILE]
         if os.path.exists(os.path.expanduser(redshiftclirc)):
             config_files.append(redshiftclirc)
@@ -64,7 +80,6 @@ For more details about the error, you can check the log file: %s''' % (
             sys.exit(1)
 
         # Initialize other attributes from config
-        from athenacli.packages import special
         special.set_timing_enabled(_cfg['main'].as_bool('timing'))
         self.multi_line = _cfg['main'].as_bool('multi_line')
         self.key_bindings = _cfg['main']['key_bindings']
@@ -73,13 +88,6 @@ For more details about the error, you can check the log file: %s''' % (
         self.syntax_style = _cfg['main']['syntax_style']
         self.prompt_continuation_format = _cfg['main']['prompt_continuation']
 
-        from cli_helpers.tabular_output import TabularOutputFormatter
-        from athenacli.packages.tabular_output import sql_format
-        from athenacli.clistyle import style_factory_output
-        from athenacli.completer import AthenaCompleter
-        from athenacli.completion_refresher import CompletionRefresher
-        import threading
-
         self.formatter = TabularOutputFormatter(_cfg['main']['table_format'])
         self.formatter.cli = self
         sql_format.register_new_formatter(self.formatter)
@@ -87,10 +95,11 @@ For more details about the error, you can check the log file: %s''' % (
         self.cli_style = _cfg['colors']
         self.output_style = style_factory_output(self.syntax_style, self.cli_style)
 
-        # Reuse AthenaCompleter as it's generic SQL
-        self.completer = AthenaCompleter()
+        # AthenaCompleter is reused as it's generic SQL; it is created by
+        # init_completion() once the interactive prompt starts.
+        self.completer = None
         self._completer_lock = threading.Lock()
-        self.completion_refresher = CompletionRefresher()
+        self.completion_refresher = None
 
         self.prompt_app = None
         self.query_history = []
@@ -113,9 +122,12 @@ For more details about the error, you can check the log file: %s''' % (
             password=redshift_config.password,
             sslmode=redshift_config.sslmode,
             aws_profile=redshift_config.aws_profile,
-            region=redshift_config.region
+            region=redshift_config.region,
+            fetch_size=redshift_config.fetch_size
         )
-        self.sqlexecute = SQLExecute(backend)
+        self.sqlexecute = SQLExecute(
+            backend, async_pipeline=self.async_pipeline,
+            batch_statements=self.batch_statements)
 
     def get_prompt(self, string):
         """Override to support Redshift-specific prompt placeholders.
@@ -129,17 +141,18 @@ For more details about the error, you can check the log file: %s''' % (
         # First call parent to handle base placeholders (\d, \r, date/time)
         string = super().get_prompt(string)
 
-        # Add Redshift-specific placeholders
+        # Add Redshift-specific placeholders in a single pass
         backend = self.sqlexecute.backend
-        string = string.replace('\\h', backend.host or '(none)')
-        string = string.replace('\\p', str(backend.port) if backend.port else '(none)')
-        string = string.replace('\\u', backend.user or '(none)')
-
-        from datetime import datetime
-        now = datetime.now()
-        string = string.replace('\\t', now.strftime('%H:%M:%S'))
+        subs = {
+            '\\h': backend.host or '(none)',
+            '\\p': str(backend.port) if backend.port else '(none)',
+            '\\u': backend.user or '(none)',
+        }
+        if '\\t' in string:
+            subs['\\t'] = datetime.now().strftime('%H:%M:%S')
 
-        return string
+        return PROMPT_PLACEHOLDER_RE.sub(
+            lambda match: subs.get(match.group(), match.group()), string)
 
 
 @click.command()
@@ -162,11 +175,19 @@ For more details about the error, you can check the log file: %s''' % (
 @click.option('--redshiftclirc', default=REDSHIFTCLIRC,
               type=click.Path(dir_okay=False),
               help='Location of redshiftclirc file.')
+@click.option('--async-pipeline', is_flag=True,
+              help='Run the next read-only statement of a multi-statement query '
+                   'while the results of the previous one are shown.')
+@click.option('--batch-statements', is_flag=True,
+              help='Send consecutive INSERT, UPDATE, DELETE, CREATE TABLE and '
+                   'CREATE VIEW statements in one round trip. They run in a '
+                   'single transaction.')
 @click.option('--table-format', type=str, default='csv',
               help='Table format used with -e option.')
 @click.argument('database', default='dev', nargs=1)
 def cli(execute, host, port, user, password, sslmode, aws_profile, region,
-        redshiftclirc, table_format, database):
+        redshiftclirc, async_pipeline, batch_statements, table_format,
+        database):
     """A Redshift terminal client with auto-completion and syntax highlighting.
 
     \b
@@ -198,16 +219,15 @@ def cli(execute, host, port, user, password, sslmode, aws_profile, region,
         sslmode=sslmode,
         aws_profile=aws_profile,
         region=region,
-        redshiftclirc=redshiftclirc
+        redshiftclirc=redshiftclirc,
+        async_pipeline=async_pipeline,
+        batch_statements=batch_statements
     )
 
     # Handle --execute argument
     if execute:
         if execute == '-':
-            if select.select([sys.stdin, ], [], [], 0.0)[0]:
-                query = sys.stdin.read()
-            else:
-                raise RuntimeError("No query to execute on stdin")
+            query = read_stdin_query()
         elif os.path.exists(execute):
             with open(execute) as f:
                 query = f.read()
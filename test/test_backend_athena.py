@@ -0,0 +1,131 @@
+import time
+
+import pytest
+from mock import Mock, patch
+
+from athenacli.backends.athena import AthenaBackend
+
+
+@patch('athenacli.backends.athena.pyathena.connect')
+def test_connect_switches_database_on_connection(connect):
+    backend = AthenaBackend(database='default')
+
+    backend.connect('other')
+
+    assert connect.call_count == 1
+    assert backend.conn.schema_name == 'other'
+    assert backend.database == 'other'
+
+
+@patch('athenacli.backends.athena.pyathena.connect')
+def test_connect_without_database_reconnects(connect):
+    """A new connection renews e.g. assumed role credentials."""
+    old_conn, new_conn = Mock(), Mock()
+    connect.side_effect = [old_conn, new_conn]
+    backend = AthenaBackend(database='default', role_arn='arn:aws:iam::1:role/r')
+
+    backend.connect()
+
+    assert connect.call_count == 2
+    assert connect.call_args[1]['schema_name'] == 'default'
+    assert connect.call_args[1]['role_arn'] == 'arn:aws:iam::1:role/r'
+    assert backend.conn is new_conn
+    # the old connection is closed in the background
+    for _ in range(50):
+        if old_conn.close.called:
+            break
+        time.sleep(0.01)
+    old_conn.close.assert_called_once_with()
+    assert not new_conn.close.called
+
+
+@patch('athenacli.backends.athena.pyathena.connect')
+def test_metadata_cursor_uses_shared_connection(connect):
+    backend = AthenaBackend(database='default')
+    backend.connect('other')
+
+    with backend.metadata_cursor() as cur:
+        pass
+
+    assert cur is connect.return_value.cursor.return_value.__enter__.return_value
+    assert connect.call_count == 1
+
+
+def poll_cursor(states, kill_on_interrupt=True):
+    from pyathena.model import AthenaQueryExecution
+    from athenacli.backends.athena import AthenaCursor, POLL_INTERVAL_MIN
+
+    cursor = object.__new__(AthenaCursor)
+    cursor._poll_interval = POLL_INTERVAL_MIN
+    cursor._on_poll = None
+    cursor._kill_on_interrupt = kill_on_interrupt
+    cursor._cancel = Mock()
+    cursor._get_query_execution = Mock(side_effect=[
+        Mock(state=getattr(AthenaQueryExecution, 'STATE_' + state))
+        for state in states])
+    return cursor
+
+
+@patch('athenacli.backends.athena.time.sleep')
+def test_poll_backs_off_exponentially(sleep):
+    from athenacli.backends.athena import POLL_INTERVAL_MAX
+
+    cursor = poll_cursor(['RUNNING'] * 20 + ['SUCCEEDED'])
+
+    assert cursor._poll('query-id').state == 'SUCCEEDED'
+
+    intervals = [c[0][0] for c in sleep.call_args_list]
+    assert len(intervals) == 20
+    assert intervals[:3] == [0.01, 0.015, 0.0225]
+    assert all(b == min(a * 1.5, POLL_INTERVAL_MAX)
+               for a, b in zip(intervals, intervals[1:]))
+    assert intervals[-1] == POLL_INTERVAL_MAX
+    cursor._get_query_execution.assert_called_with('query-id')
+
+
+@patch('athenacli.backends.athena.time.sleep')
+def test_poll_cancels_query_on_interrupt(sleep):
+    sleep.side_effect = [KeyboardInterrupt, None]
+    cursor = poll_cursor(['RUNNING', 'RUNNING', 'CANCELLED'])
+
+    assert cursor._poll('query-id').state == 'CANCELLED'
+    cursor._cancel.assert_called_once_with('query-id')
+    # polling starts over at the minimum interval
+    assert sleep.call_args_list[1][0][0] == 0.01
+
+
+@patch('athenacli.backends.athena.time.sleep')
+def test_poll_reraises_interrupt_without_kill_on_interrupt(sleep):
+    sleep.side_effect = KeyboardInterrupt
+    cursor = poll_cursor(['RUNNING'], kill_on_interrupt=False)
+
+    with pytest.raises(KeyboardInterrupt):
+        cursor._poll('query-id')
+    assert not cursor._cancel.called
+
+
+@patch('athenacli.backends.athena.pyathena.connect')
+def test_execute_reuses_results_only_for_read_only_statements(connect):
+    backend = AthenaBackend(database='default', result_reuse_enable=True,
+                            result_reuse_minutes=30)
+    cursor = Mock()
+
+    backend.execute(cursor, 'select 1')
+    cursor.execute.assert_called_once_with(
+        'select 1', result_reuse_enable=True, result_reuse_minutes=30)
+
+    for sql in ('insert into a select 1', 'create table a as select 1',
+                '-- comment\ndrop table a'):
+        cursor.reset_mock()
+        backend.execute(cursor, sql)
+        cursor.execute.assert_called_once_with(sql)
+
+
+@patch('athenacli.backends.athena.pyathena.connect')
+def test_execute_without_result_reuse(connect):
+    backend = AthenaBackend(database='default')
+    cursor = Mock()
+
+    backend.execute(cursor, 'select 1')
+
+    cursor.execute.assert_called_once_with('select 1')
@@ -0,0 +1,89 @@
+from mock import MagicMock, Mock, patch
+
+from athenacli.backends.base import DatabaseBackend
+
+
+class FakeBackend(DatabaseBackend):
+    def connect(self, database=None):
+        pass
+
+    def close(self):
+        pass
+
+    def create_connection(self):
+        return MagicMock()
+
+    def format_statistics(self, cursor):
+        return ''
+
+
+def test_metadata_is_cached():
+    backend = FakeBackend(database='db')
+    backend._query_tables = Mock(return_value=iter([('foo',), ('bar',)]))
+
+    assert list(backend.tables()) == [('foo',), ('bar',)]
+    assert list(backend.tables()) == [('foo',), ('bar',)]
+    assert backend._query_tables.call_count == 1
+
+
+def test_metadata_cache_expires_and_invalidates():
+    backend = FakeBackend(database='db')
+    backend._query_databases = Mock(return_value=['db'])
+
+    with patch('athenacli.backends.base.time.monotonic', return_value=0):
+        backend.databases()
+    with patch('athenacli.backends.base.time.monotonic',
+               return_value=backend.METADATA_CACHE_TTL + 1):
+        backend.databases()
+    assert backend._query_databases.call_count == 2
+
+    backend.invalidate_metadata_cache()
+    backend.databases()
+    assert backend._query_databases.call_count == 3
+
+
+def test_iter_rows_fetches_in_batches():
+    backend = FakeBackend()
+    cursor = Mock()
+    cursor.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+
+    assert list(backend.iter_rows(cursor)) == [(1,), (2,), (3,)]
+    assert cursor.arraysize == backend.FETCH_SIZE
+    assert cursor.fetchmany.call_count == 3
+
+
+def test_metadata_cursor_reuses_pooled_connections():
+    backend = FakeBackend(database='db')
+    backend.create_connection = Mock(side_effect=lambda: MagicMock())
+
+    with backend.metadata_cursor():
+        pass
+    with backend.metadata_cursor():
+        pass
+    assert backend.create_connection.call_count == 1
+
+    with backend.metadata_cursor():
+        backend.reset_pool()
+    with backend.metadata_cursor():
+        pass
+    assert backend.create_connection.call_count == 2
+
+
+def test_table_columns_query_is_parameterized():
+    backend = FakeBackend(database="it's")
+    backend.create_connection = Mock(return_value=MagicMock())
+    cursor = backend.create_connection.return_value.cursor.return_value \
+        .__enter__.return_value
+    cursor.fetchmany.return_value = []
+
+    list(backend.table_columns())
+    cursor.execute.assert_called_once_with(
+        backend.TABLE_COLUMNS_QUERY, {'schema': "it's"})
+
+
+def test_fetch_size():
+    assert FakeBackend().fetch_size == FakeBackend.FETCH_SIZE
+    assert FakeBackend(fetch_size=500).fetch_size == 500
+
+    with patch.object(FakeBackend, 'MAX_FETCH_SIZE', 1000):
+        assert FakeBackend(fetch_size=5000).fetch_size == 1000
@@ -0,0 +1,168 @@
+import pytest
+from mock import MagicMock, Mock, patch
+
+from athenacli.backends.redshift import RedshiftBackend
+
+
+class FakeError(Exception):
+    pass
+
+
+def fake_connection(database):
+    conn = MagicMock(closed=0, database=database)
+    conn.get_transaction_status.return_value = 'idle'
+    return conn
+
+
+@pytest.fixture
+def psycopg2():
+    with patch('athenacli.backends.redshift.psycopg2') as psycopg2, \
+            patch('athenacli.backends.redshift.extensions', create=True) as extensions, \
+            patch('athenacli.backends.redshift.threading.Thread') as thread:
+        psycopg2.Error = FakeError
+        psycopg2.connect.side_effect = lambda **params: fake_connection(
+            params['database'])
+        extensions.TRANSACTION_STATUS_IDLE = 'idle'
+        # close connections right away rather than in the background
+        thread.side_effect = lambda target, **_: Mock(start=target)
+        yield psycopg2
+
+
+def make_backend(**kwargs):
+    return RedshiftBackend(host='cluster.us-east-1.redshift.amazonaws.com',
+                           database='dev', user='user', password='secret',
+                           **kwargs)
+
+
+def test_connect_keeps_previous_database_connection(psycopg2):
+    backend = make_backend()
+    dev = backend.conn
+
+    backend.connect('other')
+    assert backend.conn.database == 'other'
+    assert not dev.close.called
+
+    backend.connect('dev')
+    assert backend.conn is dev
+    assert psycopg2.connect.call_count == 2
+    assert list(backend._idle_connections) == ['other']
+
+
+def test_connect_reconnects_to_current_database(psycopg2):
+    backend = make_backend()
+    dev = backend.conn
+
+    backend.connect('dev')
+
+    assert backend.conn is not dev
+    dev.close.assert_called_once_with()
+
+
+def test_connect_evicts_least_recently_used_connection(psycopg2):
+    backend = make_backend()
+    dev = backend.conn
+
+    for database in ('a', 'b', 'c'):
+        backend.connect(database)
+
+    assert list(backend._idle_connections) == ['a', 'b']
+    dev.close.assert_called_once_with()
+
+
+def test_connect_replaces_dropped_idle_connection(psycopg2):
+    backend = make_backend()
+    dev = backend.conn
+    backend.connect('other')
+    dev.cursor.return_value.__enter__.return_value.execute.side_effect = \
+        FakeError('server closed the connection unexpectedly')
+
+    backend.connect('dev')
+
+    assert backend.conn is not dev
+    assert backend.conn.database == 'dev'
+    dev.close.assert_called_once_with()
+
+
+def test_close_closes_idle_connections(psycopg2):
+    backend = make_backend()
+    dev = backend.conn
+    backend.connect('other')
+    other = backend.conn
+
+    backend.close()
+
+    dev.close.assert_called_once_with()
+    other.close.assert_called_once_with()
+    assert not backend._idle_connections
+
+
+@pytest.fixture
+def boto3():
+    with patch('athenacli.backends.redshift.boto3') as boto3, \
+            patch('athenacli.backends.redshift.threading.Timer') as timer:
+        client = boto3.Session.return_value.client.return_value
+        client.get_cluster_credentials.side_effect = lambda **params: {
+            'DbUser': 'IAM:' + params['DbUser'],
+            'DbPassword': 'password-for-' + params['DbName'],
+        }
+        boto3.timer = timer
+        yield boto3
+
+
+def make_iam_backend():
+    return RedshiftBackend(host='cluster.us-east-1.redshift.amazonaws.com',
+                           database='dev', user='IAM:user')
+
+
+def credential_requests(boto3):
+    client = boto3.Session.return_value.client.return_value
+    return [c[1]['DbName'] for c in client.get_cluster_credentials.call_args_list]
+
+
+def test_iam_credentials_are_cached(psycopg2, boto3):
+    backend = make_iam_backend()
+
+    backend.connect('dev')
+    backend.create_connection()
+
+    assert credential_requests(boto3) == ['dev']
+    assert psycopg2.connect.call_args[1]['password'] == 'password-for-dev'
+
+
+def test_iam_credentials_are_renewed_before_they_expire(psycopg2, boto3):
+    with patch('athenacli.backends.redshift.time.time', return_value=1000):
+        backend = make_iam_backend()
+
+    delay, callback = boto3.timer.call_args[0]
+    assert delay == RedshiftBackend.IAM_CREDENTIALS_DURATION - RedshiftBackend.IAM_REFRESH_MARGIN
+    assert boto3.timer.call_args[1] == {'args': ('dev',)}
+
+    # within the refresh margin, cached credentials aren't used any more
+    expiry = 1000 + RedshiftBackend.IAM_CREDENTIALS_DURATION
+    with patch('athenacli.backends.redshift.time.time',
+               return_value=expiry - RedshiftBackend.IAM_REFRESH_MARGIN):
+        backend.create_connection()
+    assert credential_requests(boto3) == ['dev', 'dev']
+
+
+def test_iam_renewal_follows_current_database(psycopg2, boto3):
+    backend = make_iam_backend()
+    backend.connect('other')
+    dev_timer = boto3.timer.return_value
+    boto3.timer.reset_mock()
+
+    backend.connect('dev')
+
+    assert credential_requests(boto3) == ['dev', 'other']
+    assert boto3.timer.call_args[1] == {'args': ('dev',)}
+    assert dev_timer.cancel.called
+
+
+def test_close_cancels_iam_renewal(psycopg2, boto3):
+    backend = make_iam_backend()
+    timer = backend._iam_timer
+
+    backend.close()
+
+    timer.cancel.assert_called_once_with()
+    assert backend._iam_timer is None
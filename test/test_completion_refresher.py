@@ -85,3 +85,78 @@ def test_refresh_with_callbacks(refresher):
         refresher.refresh(sqlexecute, callbacks)
         time.sleep(1)  # Wait for the thread to work.
         assert (callbacks[0].call_count == 1)
+
+
+def test_bg_refresh_prefetches_metadata(refresher):
+    """Metadata should be fetched before the refreshers run.
+
+    :param refresher:
+
+    """
+    callbacks = Mock()
+    sqlexecute = Mock()
+    sqlexecute.databases.return_value = ['db']
+    sqlexecute.tables.return_value = iter([('foo',)])
+    sqlexecute.table_columns.return_value = iter([('foo', 'bar')])
+
+    refresher.refreshers = {}
+    refresher._bg_refresh(sqlexecute, callbacks, {})
+
+    sqlexecute.databases.assert_called_once_with()
+    sqlexecute.tables.assert_called_once_with()
+    sqlexecute.table_columns.assert_called_once_with()
+    assert callbacks.call_count == 1
+
+
+def test_refresh_tables_redshift():
+    """Redshift tables and columns should be added unescaped.
+
+    """
+    from athenacli.backends import RedshiftBackend
+    from athenacli.completer import AthenaCompleter
+    from athenacli.completion_refresher import refresh_tables
+
+    completer = AthenaCompleter()
+    completer.extend_schemata('dev')
+    completer.set_dbname('dev')
+    executor = Mock(backend=Mock(spec=RedshiftBackend))
+    executor.tables.return_value = [('public.a',), ('public.b',)]
+    executor.table_columns.return_value = [
+        ('public.a', 'x'), ('public.a', 'y'), ('public.b', 'z')]
+
+    refresh_tables(completer, executor)
+
+    assert completer.dbmetadata['tables']['dev'] == {
+        'public.a': ['*', 'x', 'y'], 'public.b': ['*', 'z']}
+    assert {'public.a', 'public.b', 'x', 'y', 'z'} <= completer.all_completions
+
+
+def test_pending_refreshes_are_coalesced(refresher):
+    """Requests made during a refresh should collapse into the latest one.
+
+    :param refresher:
+
+    """
+    import threading
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def dummy_bg_refresh(sqlexecute, callbacks, completer_options):
+        calls.append(sqlexecute)
+        started.set()
+        release.wait(5)
+
+    refresher._bg_refresh = dummy_bg_refresh
+
+    refresher.refresh('first', Mock())
+    assert started.wait(5)
+    for sqlexecute in ('second', 'third', 'last'):
+        refresher.refresh(sqlexecute, Mock())
+    release.set()
+
+    for _ in range(50):
+        if not refresher.is_refreshing():
+            break
+        time.sleep(0.1)
+    assert calls == ['first', 'last']
@@ -150,3 +150,78 @@ def test_get_int_parsing():
     # Test invalid values fall back to default
     assert aws_config.get_int('invalid') == 60
     assert aws_config.get_int(None) == 60
+
+
+def test_read_config_file_returns_own_config(tmpdir):
+    """Test that callers changing their config don't affect other callers."""
+    from athenacli.config import read_config_file
+
+    rc = tmpdir.join('athenaclirc')
+    rc.write('[main]\ntiming = True\n')
+
+    first = read_config_file(str(rc))
+    first['main']['timing'] = 'changed'
+    assert read_config_file(str(rc))['main']['timing'] == 'True'
+
+
+def test_read_config_files_uses_cache(tmpdir):
+    """Test that config files are merged and their values cached on disk."""
+    from athenacli.config import read_config_files
+
+    cache_dir = tmpdir.join('cache')
+    default = tmpdir.join('defaultrc')
+    default.write('[main]\ntiming = True\nmulti_line = False\n')
+    user = tmpdir.join('userrc')
+    user.write('[main]\ntiming = False\n')
+
+    with patch('athenacli.config.CONFIG_CACHE_DIR', str(cache_dir)):
+        config = read_config_files([str(default), str(user)])
+        assert config['main'] == {'timing': 'False', 'multi_line': 'False'}
+        assert config.filename == str(user)
+        assert len(cache_dir.listdir()) == 2
+        assert sorted(p.basename for p in tmpdir.listdir()) == [
+            'cache', 'defaultrc', 'userrc']
+
+        with patch('athenacli.config.ConfigObj.dict') as dict_:
+            assert read_config_files([str(default), str(user)]) == config
+        assert not dict_.called
+
+
+def test_packaged_config_files_are_not_cached(tmpdir):
+    """Test that no cache is written for config files inside a package."""
+    from athenacli.config import _config_cache_path
+
+    tmpdir.join('__init__.py').write('')
+    assert _config_cache_path(str(tmpdir.join('athenaclirc'))) is None
+
+
+def test_read_config_files_returns_copies(tmpdir):
+    """Test that cached merged configs are copied and follow file changes."""
+    from athenacli.config import read_config_files
+
+    rc = tmpdir.join('athenaclirc')
+    rc.write('[main]\ntiming = True\n')
+
+    with patch('athenacli.config.CONFIG_CACHE_DIR', str(tmpdir.join('cache'))):
+        config = read_config_files([str(rc)])
+        config['main']['timing'] = 'changed'
+        assert read_config_files([str(rc)])['main']['timing'] == 'True'
+
+        rc.write('[main]\ntiming = False\n')
+        rc.setmtime(rc.mtime() + 10)
+        assert read_config_files([str(rc)])['main']['timing'] == 'False'
+
+
+def test_read_config_files_does_not_interpolate(tmpdir):
+    """Test that %(...)s in values is kept, e.g. in favorite queries."""
+    from athenacli.config import read_config_files
+
+    rc = tmpdir.join('athenaclirc')
+    rc.write("[main]\nfoo = bar\nprompt = '%(foo)s \\d> '\n"
+             "[favorite_queries]\nq = select '%(x)s'\n")
+
+    with patch('athenacli.config.CONFIG_CACHE_DIR', str(tmpdir.join('cache'))):
+        for _ in range(2):
+            config = read_config_files([str(rc)])
+            assert config['main']['prompt'] == '%(foo)s \\d> '
+            assert config['favorite_queries']['q'] == "select '%(x)s'"
@@ -2,6 +2,7 @@
 
 
 from collections import namedtuple
+from mock import Mock
 from athenacli.packages.format_utils import format_status, humanize_size
 
 
@@ -24,3 +25,13 @@ def test_humanize_size():
     assert humanize_size(200000) == "195.31 KB"
     assert humanize_size(20000000) == "19.07 MB"
     assert humanize_size(200000000000) == "186.26 GB"
+
+def test_format_status_skips_backends_without_stats():
+    backend = Mock(HAS_STATISTICS=False)
+
+    assert format_status(rows_length=3, cursor=object(), backend=backend) == "3 rows in set"
+    assert not backend.format_statistics.called
+
+def test_format_status_row_count_callback():
+    assert format_status(row_count_callback=lambda: 3) == "3 rows in set"
+    assert format_status(rows_length=5, row_count_callback=lambda: 0) == "Query OK"
@@ -1,6 +1,7 @@
 import pytest
 from athenacli.packages.parseutils import (
-    extract_tables, query_starts_with, queries_start_with, is_destructive
+    extract_tables, query_starts_with, queries_start_with, is_destructive,
+    is_read_only
 )
 
 
@@ -135,3 +136,19 @@ def test_is_destructive():
         'drop database foo;'
     )
     assert is_destructive(sql) is True
+
+
+def test_is_read_only():
+    assert is_read_only('SELECT * FROM foo') is True
+    assert is_read_only('-- comment\nwith t as (select 1) select * from t') is True
+    assert is_read_only('show tables') is True
+    assert is_read_only('DESCRIBE foo') is True
+    assert is_read_only('CREATE TABLE foo AS SELECT 1') is False
+    assert is_read_only('insert into foo select * from bar') is False
+
+
+def test_is_read_only_skips_comments():
+    assert is_read_only('/* multi\nline */ SELECT 1') is True
+    assert is_read_only('# comment\n  show databases') is True
+    assert is_read_only('-- select\ndrop table foo') is False
+    assert is_read_only('') is False
@@ -0,0 +1,243 @@
+import threading
+import time
+
+from mock import MagicMock, Mock, patch
+
+from athenacli.backends.base import DatabaseBackend
+from athenacli.packages import special
+from athenacli.sqlexecute import SQLExecute
+
+
+class FakeBackend(DatabaseBackend):
+    def connect(self, database=None):
+        pass
+
+    def close(self):
+        pass
+
+    def create_connection(self):
+        return MagicMock()
+
+    def format_statistics(self, cursor):
+        return ''
+
+
+def test_get_result_streams_rows():
+    backend = FakeBackend()
+    cursor = Mock(description=[('a',), ('b',)])
+    cursor.fetchmany.side_effect = [[(1, 2), (3, 4)], [(5, 6)], []]
+
+    title, rows, headers, status = SQLExecute(backend).get_result(cursor)
+
+    assert headers == ['a', 'b']
+    assert not cursor.fetchmany.called
+    assert next(rows) == (1, 2)
+    assert status() == '2 rows in set'
+    assert list(rows) == [(3, 4), (5, 6)]
+    assert status() == '3 rows in set'
+
+
+def test_get_result_without_result_set():
+    cursor = Mock(description=None)
+
+    assert SQLExecute(FakeBackend()).get_result(cursor) == (
+        None, None, None, 'Query OK')
+
+
+def test_run_splits_statements():
+    backend = FakeBackend()
+    backend.conn = Mock()
+    backend.conn.cursor.return_value.description = None
+    sqlexecute = SQLExecute(backend)
+
+    for sql in ('select 1', 'select 1;'):
+        assert len(list(sqlexecute.run(sql))) == 1
+    backend.conn.cursor.return_value.execute.assert_called_with('select 1')
+
+    assert len(list(sqlexecute.run("select ';'; select 2"))) == 2
+
+
+def test_run_reuses_cursor_until_result_set():
+    def execute(cursor, sql):
+        cursor.description = [('a',)] if sql.startswith('select') else None
+
+    backend = FakeBackend()
+    backend.conn = Mock()
+    cursors = [Mock(), Mock()]
+    for cursor in cursors:
+        cursor.execute.side_effect = lambda sql, cursor=cursor: execute(cursor, sql)
+        cursor.fetchmany.return_value = []
+    backend.conn.cursor.side_effect = cursors
+
+    statements = ['create table a (a int)', 'drop table b', 'select 1',
+                  'insert into a values (1)']
+    results = list(SQLExecute(backend).run('; '.join(statements)))
+
+    assert len(results) == 4
+    assert [c[0][0] for c in cursors[0].execute.call_args_list] == statements[:3]
+    assert [c[0][0] for c in cursors[1].execute.call_args_list] == statements[3:]
+
+
+def test_run_gets_new_cursor_after_special_command():
+    backend = FakeBackend()
+    backend.conn = Mock()
+    cursors = [Mock(description=None), Mock(description=None),
+               Mock(description=None)]
+    backend.conn.cursor.side_effect = cursors
+    use = Mock(return_value=[(None, None, None, 'Changed database')])
+
+    with patch.dict('athenacli.packages.special.main.COMMANDS'):
+        special.register_special_command(use, 'use', '\\u', 'Change database.')
+        sql = 'create table a (x int); use other; create table b (x int)'
+        results = list(SQLExecute(backend).run(sql))
+
+    assert len(results) == 3
+    cursors[0].execute.assert_called_once_with('create table a (x int)')
+    assert use.call_args[1]['cur'] is cursors[1]
+    cursors[2].execute.assert_called_once_with('create table b (x int)')
+
+
+def test_run_expanded_statement():
+    backend = FakeBackend()
+    backend.conn = Mock()
+    cursor = backend.conn.cursor.return_value
+    cursor.description = None
+
+    try:
+        list(SQLExecute(backend).run('select 1 \\G ;'))
+        assert special.is_expanded_output()
+    finally:
+        special.set_expanded_output(False)
+    cursor.execute.assert_called_once_with('select 1')
+
+
+def test_run_splits_statements_lazily():
+    backend = FakeBackend()
+    backend.conn = Mock()
+    cursor = backend.conn.cursor.return_value
+    cursor.description = None
+
+    results = SQLExecute(backend).run('select 1; select 2; select 3')
+    next(results)
+
+    cursor.execute.assert_called_once_with('select 1')
+
+
+def test_run_batches_statements():
+    backend = FakeBackend()
+    backend.SUPPORTS_MULTI_STATEMENT = True
+    backend.is_batchable = lambda sql: sql.startswith('insert')
+    backend.conn = Mock()
+    cursor = backend.conn.cursor.return_value
+    cursor.description = None
+
+    sql = 'insert into a values (1); insert into a values (2); select 1; insert into a values (3)'
+    results = list(SQLExecute(backend, batch_statements=True).run(sql))
+
+    assert [r[3] for r in results] == ['Query OK'] * 4
+    assert [c[0][0] for c in cursor.execute.call_args_list] == [
+        'insert into a values (1)\n;\ninsert into a values (2)',
+        'select 1',
+        'insert into a values (3)',
+    ]
+
+
+def test_run_batches_statements_ending_in_comments():
+    backend = FakeBackend()
+    backend.SUPPORTS_MULTI_STATEMENT = True
+    backend.is_batchable = lambda sql: sql.startswith('insert')
+    backend.conn = Mock()
+    cursor = backend.conn.cursor.return_value
+    cursor.description = None
+
+    sql = 'insert into a values (1) -- note\n; insert into a values (2)'
+    list(SQLExecute(backend, batch_statements=True).run(sql))
+
+    cursor.execute.assert_called_once_with(
+        'insert into a values (1) -- note\n;\ninsert into a values (2)')
+
+
+def test_run_batches_statements_only_when_enabled():
+    backend = FakeBackend()
+    backend.SUPPORTS_MULTI_STATEMENT = True
+    backend.is_batchable = lambda sql: True
+    backend.conn = Mock()
+    cursor = backend.conn.cursor.return_value
+    cursor.description = None
+
+    list(SQLExecute(backend).run('insert into a values (1); insert into a values (2)'))
+
+    assert cursor.execute.call_count == 2
+
+
+def test_run_empty_statement():
+    backend = FakeBackend()
+    backend.conn = Mock()
+
+    assert list(SQLExecute(backend).run('  ')) == [(None, None, None, None)]
+    assert not backend.conn.cursor.called
+
+
+def test_run_async_pipeline():
+    backend = FakeBackend()
+    backend.conn = Mock()
+    backend.conn.cursor.return_value.description = None
+    executed = []
+    backend.execute = lambda cur, sql: executed.append(sql)
+    sqlexecute = SQLExecute(backend, async_pipeline=True)
+
+    results = sqlexecute.run('select 1; select 2; select 3')
+    next(results)
+    # the second statement runs while the first result is consumed
+    for _ in range(50):
+        if len(executed) == 2:
+            break
+        time.sleep(0.01)
+    assert executed == ['select 1', 'select 2']
+
+    assert len(list(results)) == 2
+    assert executed == ['select 1', 'select 2', 'select 3']
+
+
+def test_run_async_pipeline_defers_writes():
+    backend = FakeBackend()
+    backend.conn = Mock()
+    backend.conn.cursor.return_value.description = None
+    executed = []
+    backend.execute = lambda cur, sql: executed.append(sql)
+    sqlexecute = SQLExecute(backend, async_pipeline=True)
+
+    results = sqlexecute.run('select 1; delete from important; select 2')
+    next(results)
+    results.close()
+
+    assert executed == ['select 1']
+
+
+def test_run_async_pipeline_runs_steps_on_calling_thread():
+    backend = FakeBackend()
+    backend.conn = Mock()
+    backend.conn.cursor.side_effect = lambda: Mock(description=None)
+    threads = {}
+    started = threading.Event()
+    release = threading.Event()
+
+    def execute(cur, sql):
+        threads[sql] = threading.current_thread()
+        if sql == 'select 2':
+            started.set()
+            release.wait(5)
+
+    backend.execute = execute
+    backend.cancel = Mock()
+
+    results = SQLExecute(backend, async_pipeline=True).run('select 1; select 2')
+    next(results)
+    assert started.wait(5)
+    results.close()
+    release.set()
+
+    assert threads['select 1'] is threading.current_thread()
+    assert threads['select 2'] is not threading.current_thread()
+    # the statement running ahead is cancelled rather than waited for
+    backend.cancel.assert_called_once()